@@ -1,6 +1,11 @@
-from django.contrib import admin
-from .models import Conversation
-
-@admin.register(Conversation)
-class ConversationAdmin(admin.ModelAdmin):
-    list_display = ("id", "role", "message", "created_at")
\ No newline at end of file
+from django.contrib import admin
+from .models import Conversation, ConversationSummary
+
+@admin.register(Conversation)
+class ConversationAdmin(admin.ModelAdmin):
+    list_display = ("id", "role", "message", "created_at")
+
+
+@admin.register(ConversationSummary)
+class ConversationSummaryAdmin(admin.ModelAdmin):
+    list_display = ("user", "job", "summarized_until", "updated_at")
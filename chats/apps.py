@@ -1,6 +1,9 @@
-from django.apps import AppConfig
-
-
-class ChatsConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'chats'
+from django.apps import AppConfig
+
+
+class ChatsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'chats'
+
+    def ready(self):
+        import chats.signals
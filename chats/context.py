@@ -0,0 +1,99 @@
+import os
+import uuid
+import hashlib
+from django.core.cache import cache
+from django.db import transaction
+from cv.models import CV
+from jobs.models import Job
+
+# Blok konteks lowongan & CV untuk prompt chat di-cache supaya giliran berikutnya tidak
+# query DB dan merangkai ulang teks. Isi disimpan per versi (job: updated_at, CV: hash
+# parsed_text); key "pointer" per objek menunjuk versi terbaru dan diganti saat model
+# disimpan, termasuk lewat bulk upsert crawler (lihat chats/signals.py), jadi versi lama
+# tidak pernah dipakai lagi.
+CONTEXT_TTL = int(os.getenv("CHAT_CONTEXT_CACHE_TTL", 6 * 3600))
+
+
+def pointer_key(kind, object_id):
+    return f"chat-context:{kind}:{object_id}"
+
+
+def job_version(job):
+    return job.updated_at.isoformat()
+
+
+def cv_version(cv):
+    return hashlib.sha1((cv.parsed_text or "").encode("utf-8")).hexdigest()
+
+
+def render_job_context(job):
+    return (
+        f"Judul Pekerjaan: {job.job_title or '-'}\n"
+        f"Nama Perusahaan: {job.company_name or '-'}\n"
+        f"Industri Perusahaan: {job.company_industry or '-'}\n"
+        f"Deskripsi Perusahaan: {job.company_desc or '-'}\n"
+        f"Ukuran Perusahaan: {job.company_employee_size or '-'}\n"
+        f"Industri Pekerjaan: {job.industry or '-'}\n"
+        f"Lokasi: {job.location or '-'}\n"
+        f"Tipe Pekerjaan: {job.job_type or '-'}\n"
+        f"Level Pengalaman: {job.experience_level or '-'}\n"
+        f"Tingkat Pendidikan: {job.education_level or '-'}\n"
+        f"Gaji: {job.salary or '-'}\n"
+        f"Tanggal Diposting: {job.date_posted or '-'}\n"
+        f"Keahlian yang Dibutuhkan: {job.skills_required or '-'}\n"
+        f"Deskripsi Pekerjaan:\n{job.job_description or '-'}\n"
+        f"Link Lowongan: {job.url}\n"
+    )
+
+
+def cached_context(kind, object_id, load):
+    """Teks konteks dari cache, atau load(object_id) -> (versi, teks) dari DB lalu disimpan."""
+    pointer = pointer_key(kind, object_id)
+    version = cache.get(pointer)
+    if version is not None:
+        text = cache.get(f"{pointer}:{version}")
+        if text is not None:
+            return text
+
+    loaded = load(object_id)
+    if loaded is None:
+        return None
+    version, text = loaded
+    cache.set(f"{pointer}:{version}", text, CONTEXT_TTL)
+    # add, bukan set: kalau model baru saja disimpan, pointer versi baru jangan ditimpa
+    cache.add(pointer, version, CONTEXT_TTL)
+    return text
+
+
+def load_job(job_id):
+    job = Job.objects.filter(id=job_id).first()
+    return (job_version(job), render_job_context(job)) if job else None
+
+
+def load_cv(cv_id):
+    cv = CV.objects.filter(id=cv_id).only("id", "parsed_text").first()
+    return (cv_version(cv), cv.parsed_text or "") if cv else None
+
+
+def job_context(job_id):
+    """Blok konteks lowongan untuk prompt, None kalau lowongan tidak ada."""
+    return cached_context("job", uuid.UUID(str(job_id)), load_job)
+
+
+def cv_context(cv_id):
+    """parsed_text CV untuk prompt, None kalau CV tidak ada."""
+    return cached_context("cv", cv_id, load_cv)
+
+
+def repoint(kind, object_id, version):
+    # setelah commit, supaya pembaca yang belum melihat data baru tidak menyimpannya sebagai versi baru
+    transaction.on_commit(lambda: cache.set(pointer_key(kind, object_id), version, CONTEXT_TTL))
+
+
+def forget(kind, object_id):
+    transaction.on_commit(lambda: cache.delete(pointer_key(kind, object_id)))
+
+
+def forget_many(kind, object_ids):
+    keys = [pointer_key(kind, object_id) for object_id in object_ids]
+    transaction.on_commit(lambda: cache.delete_many(keys))
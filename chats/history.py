@@ -0,0 +1,100 @@
+import os
+import logging
+from core.ai.pm import PromptManager
+from core.ai.tokens import count_tokens, truncate_tokens
+from .models import Conversation, ConversationSummary
+
+logger = logging.getLogger(__name__)
+
+# History chat per (user, lowongan) yang dikirim ke LLM dibatasi token: pesan terbaru
+# masuk utuh, pesan lama dilipat ke satu ringkasan berjalan (ConversationSummary).
+# Ringkasan diperbarui setelah balasan terkirim dan langsung memangkas history ke
+# setengah budget, jadi tidak perlu meringkas ulang di setiap giliran.
+HISTORY_MAX_TOKENS = int(os.getenv("CHAT_HISTORY_MAX_TOKENS", 2000))
+HISTORY_MAX_MESSAGES = int(os.getenv("CHAT_HISTORY_MAX_MESSAGES", 50))  # batas baris yang dimuat dari DB
+SUMMARY_MAX_TOKENS = int(os.getenv("CHAT_SUMMARY_MAX_TOKENS", 500))
+SUMMARY_INPUT_MAX_TOKENS = int(os.getenv("CHAT_SUMMARY_INPUT_MAX_TOKENS", 6000))  # transkrip per panggilan ringkasan
+
+
+def recent_messages(user_id, job_id, after=None, limit=HISTORY_MAX_MESSAGES):
+    """Pesan (user, lowongan) terbaru dulu, memakai index (user, job, created_at). limit=None: semua."""
+    queryset = Conversation.objects.filter(user_id=user_id, job_id=job_id)
+    if after is not None:
+        queryset = queryset.filter(created_at__gt=after)
+    queryset = queryset.order_by("-created_at").only("role", "message", "created_at")
+    return list(queryset[:limit] if limit else queryset)
+
+
+def split_by_budget(messages, max_tokens):
+    """Bagi pesan (terbaru dulu) jadi yang muat di budget dan sisanya yang lebih lama."""
+    used = 0
+    for index, message in enumerate(messages):
+        used += count_tokens(message.message)
+        if used > max_tokens:
+            return messages[:index], messages[index:]
+    return messages, []
+
+
+def load_history(user_id, job_id):
+    """Pesan untuk prompt: ringkasan berjalan (kalau ada) lalu pesan terbaru dalam budget token."""
+    summary = ConversationSummary.objects.filter(user_id=user_id, job_id=job_id).first()
+    messages = recent_messages(user_id, job_id, after=summary.summarized_until if summary else None)
+    kept, _ = split_by_budget(messages, HISTORY_MAX_TOKENS)
+
+    history = []
+    if summary and summary.summary:
+        history.append({"role": "system", "content": f"Ringkasan percakapan sebelumnya:\n{summary.summary}"})
+    history.extend({"role": message.role, "content": message.message} for message in reversed(kept))
+    return history
+
+
+def chunk_by_tokens(messages, max_tokens):
+    """Bagi pesan (urut waktu) jadi potongan transkrip yang masing-masing muat di max_tokens."""
+    chunk, used = [], 0
+    for message in messages:
+        tokens = count_tokens(message.message)
+        if chunk and used + tokens > max_tokens:
+            yield chunk
+            chunk, used = [], 0
+        chunk.append(message)
+        used += tokens
+    if chunk:
+        yield chunk
+
+
+def summarize(previous_summary, messages):
+    transcript = "\n".join(f"{message.role}: {message.message}" for message in messages)
+    pm = PromptManager()
+    pm.add_message("system", f"""
+        Ringkas percakapan antara user dan asisten tentang CV dan lowongan kerja berikut.
+        Gabungkan dengan ringkasan sebelumnya (kalau ada). Simpan fakta penting tentang user,
+        pertanyaan yang sudah dijawab dan kesimpulannya. Maksimal {SUMMARY_MAX_TOKENS} token.
+    """)
+    pm.add_message("user", f"Ringkasan sebelumnya:\n{previous_summary or '-'}\n\nPercakapan baru:\n{transcript}")
+    return truncate_tokens(pm.generate(), SUMMARY_MAX_TOKENS)
+
+
+def roll_summary(user_id, job_id):
+    """
+    Kalau history (setelah ringkasan) melebihi budget, lipat pesan yang lebih lama ke
+    ringkasan sampai history tersisa setengah budget. Return True kalau ringkasan diperbarui.
+    """
+    summary = ConversationSummary.objects.filter(user_id=user_id, job_id=job_id).first()
+    # semua pesan setelah summarized_until (tanpa batas jumlah), supaya tidak ada yang terlewat
+    messages = recent_messages(user_id, job_id, after=summary.summarized_until if summary else None, limit=None)
+    _, overflow = split_by_budget(messages, HISTORY_MAX_TOKENS)
+    if not overflow:
+        return False
+
+    _, folded = split_by_budget(messages, HISTORY_MAX_TOKENS // 2)
+    folded = list(reversed(folded))  # urut waktu
+    text = summary.summary if summary else ""
+    for chunk in chunk_by_tokens(folded, SUMMARY_INPUT_MAX_TOKENS):
+        text = summarize(text, chunk)
+    ConversationSummary.objects.update_or_create(
+        user_id=user_id,
+        job_id=job_id,
+        defaults={"summary": text, "summarized_until": folded[-1].created_at},
+    )
+    logger.info(f"🧾 Chat summary user {user_id} job {job_id}: folded {len(folded)} messages")
+    return True
@@ -1,13 +1,80 @@
-from asgiref.sync import async_to_sync
-from channels.layers import get_channel_layer
-
-
-def send_chat_message(message):
-    channel_layer = get_channel_layer()
-    async_to_sync(channel_layer.group_send)(
-        "chat",
-        {
-            "type": "send_message",
-            "message": message,
-        },
-    )
+import os
+import re
+import time
+import uuid
+import hashlib
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+# delta token dikumpulkan sebentar sebelum dikirim supaya tidak satu pesan channel layer
+# per token; delta pertama selalu langsung dikirim (time-to-first-token)
+STREAM_FLUSH_CHARS = int(os.getenv("CHAT_STREAM_FLUSH_CHARS", 32))
+STREAM_FLUSH_MS = int(os.getenv("CHAT_STREAM_FLUSH_MS", 80))
+
+
+def chat_group(user_id, document_id):
+    """Group channel per (user, dokumen): balasan hanya dikirim ke socket chat milik user itu."""
+    name = f"chat_{user_id}_{document_id}"
+    # nama group channels hanya boleh ASCII alfanumerik, "-", "_", "." dan < 100 karakter
+    if not re.fullmatch(r'[A-Za-z0-9_.-]{1,99}', name):
+        name = f"chat_{hashlib.sha1(name.encode('utf-8')).hexdigest()}"
+    return name
+
+
+def send_chat_event(user_id, document_id, payload):
+    channel_layer = get_channel_layer()
+    async_to_sync(channel_layer.group_send)(
+        chat_group(user_id, document_id),
+        {
+            "type": "send_message",
+            **payload,
+        },
+    )
+
+
+def send_chat_message(user_id, document_id, message):
+    send_chat_event(user_id, document_id, {"message": message})
+
+
+def stream_chat_message(user_id, document_id, deltas):
+    """
+    Teruskan delta dari PromptManager.generate_stream() ke client sebagai frame
+    {"event": "delta", "stream_id", "delta"}. Return (stream_id, teks lengkap); frame
+    "commit" dikirim pemanggil setelah pesan disimpan (send_chat_commit).
+    """
+    stream_id = uuid.uuid4().hex
+    parts, pending = [], []
+    last_flush = None
+
+    def flush():
+        nonlocal last_flush
+        send_chat_event(user_id, document_id, {"event": "delta", "stream_id": stream_id, "delta": "".join(pending)})
+        pending.clear()
+        last_flush = time.perf_counter()
+
+    try:
+        for delta in deltas:
+            parts.append(delta)
+            pending.append(delta)
+            if (
+                last_flush is None
+                or sum(map(len, pending)) >= STREAM_FLUSH_CHARS
+                or (time.perf_counter() - last_flush) * 1000 >= STREAM_FLUSH_MS
+            ):
+                flush()
+    except Exception:
+        # client membuang delta stream ini
+        send_chat_event(user_id, document_id, {"event": "error", "stream_id": stream_id})
+        raise
+    if pending:
+        flush()
+    return stream_id, "".join(parts)
+
+
+def send_chat_commit(user_id, document_id, stream_id, message, message_id):
+    send_chat_event(user_id, document_id, {
+        "event": "commit",
+        "stream_id": stream_id,
+        "message": message,
+        "message_id": str(message_id),
+    })
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.3 on 2026-10-19 19:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chats', '0003_alter_conversation_id'),
+        ('cv', '0002_ocrcache'),
+        ('jobs', '0007_crawlitem_keyword'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConversationSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('summary', models.TextField(blank=True)),
+                ('summarized_until', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['user', 'job', 'created_at'], name='chats_user_job_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='conversationsummary',
+            name='job',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='jobs.job'),
+        ),
+        migrations.AddField(
+            model_name='conversationsummary',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='conversationsummary',
+            constraint=models.UniqueConstraint(fields=('user', 'job'), name='chats_summary_user_job_unique'),
+        ),
+    ]
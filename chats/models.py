@@ -1,23 +1,43 @@
-from django.db import models
-import bson
-from jobs.models import Job
-from django.conf import settings
-from cv.models import CV
-import uuid
-
-
-def generate_id():
-    return str(bson.ObjectId())
-
-class Conversation(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-
-    role = models.CharField(max_length=255)
-    message = models.TextField()
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, on_delete=models.SET_NULL)
-    cv = models.ForeignKey(CV, on_delete=models.SET_NULL, null=True) 
-    job = models.ForeignKey(Job, on_delete=models.SET_NULL, null=True)
-
+from django.db import models
+import bson
+from jobs.models import Job
+from django.conf import settings
+from cv.models import CV
+import uuid
+
+
+def generate_id():
+    return str(bson.ObjectId())
+
+class Conversation(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    role = models.CharField(max_length=255)
+    message = models.TextField()
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, on_delete=models.SET_NULL)
+    cv = models.ForeignKey(CV, on_delete=models.SET_NULL, null=True) 
+    job = models.ForeignKey(Job, on_delete=models.SET_NULL, null=True)
+
+    class Meta:
+        indexes = [
+            # riwayat chat dimuat per (user, lowongan), urut waktu
+            models.Index(fields=["user", "job", "created_at"], name="chats_user_job_created_idx"),
+        ]
+
+
+class ConversationSummary(models.Model):
+    """Ringkasan berjalan percakapan (user, lowongan) yang sudah keluar dari jendela history."""
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, null=True)
+    summary = models.TextField(blank=True)
+    summarized_until = models.DateTimeField()  # created_at pesan terakhir yang sudah masuk ringkasan
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "job"], name="chats_summary_user_job_unique"),
+        ]
@@ -0,0 +1,132 @@
+import os
+import re
+import hashlib
+import logging
+import threading
+import numpy as np
+from django.core.cache import cache
+from core.ai.chromadb import embedding_function
+
+logger = logging.getLogger(__name__)
+
+# Gate relevansi chat lokal sebelum LLM: kemiripan embedding dengan contoh pertanyaan
+# relevan/tidak relevan, dibantu keyword. Keyword saja tidak pernah memutuskan (kata seperti
+# "musik" atau "kerja" muncul di pertanyaan karier maupun di luar topik): keyword on-topic
+# hanya menurunkan ambang embedding untuk menerima, dan menahan penolakan oleh embedding.
+# Pesan yang ragu-ragu dikirim ke gate LLM (analyze_question). Keputusan di-cache per pesan
+# yang sudah dinormalisasi.
+RELEVANT_MIN_SIMILARITY = float(os.getenv("CHAT_RELEVANT_MIN_SIMILARITY", 0.5))
+KEYWORD_RELEVANT_MIN_SIMILARITY = float(os.getenv("CHAT_KEYWORD_RELEVANT_MIN_SIMILARITY", 0.4))
+IRRELEVANT_MIN_SIMILARITY = float(os.getenv("CHAT_IRRELEVANT_MIN_SIMILARITY", 0.45))
+SIMILARITY_MARGIN = float(os.getenv("CHAT_RELEVANCE_MARGIN", 0.08))
+CACHE_TTL = int(os.getenv("CHAT_RELEVANCE_CACHE_TTL", 7 * 24 * 3600))
+
+ON_TOPIC_RE = re.compile(
+    r'\b(?:cv|resume|curriculum vitae|lowongan|loker|pekerjaan|kerja|karir|karier|posisi|jabatan|'
+    r'perusahaan|gaji|salary|tunjangan|benefit|skill|skills|keahlian|keterampilan|kemampuan|'
+    r'pengalaman|pendidikan|jurusan|ipk|sertifikat|sertifikasi|portofolio|portfolio|kualifikasi|'
+    r'persyaratan|syarat|requirement|requirements|cocok|kecocokan|kesesuaian|melamar|lamar|'
+    r'lamaran|apply|interview|wawancara|rekrutmen|hrd|recruiter|job|jobdesk|deskripsi pekerjaan|'
+    r'remote|wfh|full time|part time|magang|internship|fresh graduate|kontrak)\b'
+)
+OFF_TOPIC_RE = re.compile(
+    r'\b(?:politik|presiden|pemilu|partai|film|drama|lagu|musik|anime|game|resep|masak|makanan|'
+    r'sepak bola|bola|cuaca|zodiak|ramalan|pacar|gebetan|jodoh|agama|gosip|selebriti|artis|'
+    r'puisi|pantun|lelucon|jokes|crypto|saham|togel|judi)\b'
+)
+
+RELEVANT_PROTOTYPES = [
+    "Apakah CV saya cocok dengan lowongan ini?",
+    "Skill apa yang kurang dari CV saya untuk posisi ini?",
+    "Bagaimana cara memperbaiki CV saya agar lolos seleksi?",
+    "Berapa gaji untuk pekerjaan ini?",
+    "Apa saja tanggung jawab di posisi ini?",
+    "Apa yang harus saya persiapkan untuk interview pekerjaan ini?",
+    "Apakah pengalaman saya cukup untuk melamar di perusahaan ini?",
+    "Jelaskan persyaratan lowongan ini",
+    "Sertifikasi apa yang sebaiknya saya ambil untuk pekerjaan ini?",
+    "Is my resume a good fit for this job?",
+    "Apa yang perlu saya pelajari untuk bekerja di industri ini?",
+    "Bagaimana peluang karier saya di bidang ini?",
+]
+IRRELEVANT_PROTOTYPES = [
+    "Siapa presiden Indonesia sekarang?",
+    "Rekomendasi film yang bagus untuk ditonton",
+    "Bagaimana cuaca hari ini?",
+    "Buatkan resep nasi goreng",
+    "Ceritakan lelucon lucu",
+    "Siapa yang menang pertandingan sepak bola kemarin?",
+    "Tolong buatkan puisi cinta",
+    "Tolong kerjakan PR matematika saya",
+    "What is the capital of France?",
+]
+
+_prototypes = None
+_prototypes_lock = threading.Lock()
+
+
+def normalize_message(message):
+    return " ".join(re.sub(r'[^\w\s]', ' ', message.lower()).split())
+
+
+def keyword_hints(normalized):
+    """(ada keyword on-topic, ada keyword off-topic) — petunjuk saja, bukan keputusan."""
+    return ON_TOPIC_RE.search(normalized) is not None, OFF_TOPIC_RE.search(normalized) is not None
+
+
+def embed(texts):
+    vectors = np.asarray(embedding_function(texts), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def get_prototypes():
+    global _prototypes
+    with _prototypes_lock:
+        if _prototypes is None:
+            _prototypes = (embed(RELEVANT_PROTOTYPES), embed(IRRELEVANT_PROTOTYPES))
+        return _prototypes
+
+
+def embedding_decision(message, on_topic, off_topic):
+    relevant, irrelevant = get_prototypes()
+    vector = embed([message])[0]
+    relevant_score = float((relevant @ vector).max())
+    irrelevant_score = float((irrelevant @ vector).max())
+    if relevant_score >= RELEVANT_MIN_SIMILARITY and relevant_score - irrelevant_score >= SIMILARITY_MARGIN:
+        return True, relevant_score, irrelevant_score
+    # keyword on-topic (tanpa keyword off-topic) + embedding cukup dekat ke contoh relevan
+    if (on_topic and not off_topic and relevant_score >= KEYWORD_RELEVANT_MIN_SIMILARITY
+            and relevant_score > irrelevant_score):
+        return True, relevant_score, irrelevant_score
+    # pesan dengan keyword on-topic tidak ditolak tanpa LLM
+    if (not on_topic and irrelevant_score >= IRRELEVANT_MIN_SIMILARITY
+            and irrelevant_score - relevant_score >= SIMILARITY_MARGIN):
+        return False, relevant_score, irrelevant_score
+    return None, relevant_score, irrelevant_score
+
+
+def is_relevant_message(message, llm_gate):
+    """
+    True/False apakah pesan relevan (CV/lowongan). llm_gate(message) hanya dipanggil
+    kalau embedding (dengan petunjuk keyword) belum yakin.
+    """
+    normalized = normalize_message(message)
+    key = f"chat-relevance:{hashlib.sha1(normalized.encode('utf-8')).hexdigest()}"
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    on_topic, off_topic = keyword_hints(normalized)
+    decision = None
+    try:
+        decision, relevant_score, irrelevant_score = embedding_decision(message, on_topic, off_topic)
+        source = f"embedding ({relevant_score:.2f}/{irrelevant_score:.2f}, keyword on={on_topic} off={off_topic})"
+    except Exception as e:
+        logger.warning(f"⚠️ Relevance embedding failed, using LLM gate: {e}")
+    if decision is None:
+        decision = bool(llm_gate(message))
+        source = "llm"
+
+    logger.info(f"🚦 Chat relevance: {decision} via {source}")
+    cache.set(key, decision, CACHE_TTL)
+    return decision
@@ -0,0 +1,35 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from cv.models import CV
+from jobs.models import Job
+from jobs.signals import jobs_bulk_saved
+from .context import repoint, forget, forget_many, job_version, cv_version
+
+
+@receiver(post_save, sender=Job)
+def job_saved(sender, instance, **kwargs):
+    repoint("job", instance.pk, job_version(instance))
+
+
+@receiver(jobs_bulk_saved, sender=Job)
+def jobs_upserted(sender, job_ids, **kwargs):
+    # bulk_create(update_conflicts=True) tidak memicu post_save; versi baru dibaca ulang saat dipakai
+    forget_many("job", job_ids)
+
+
+@receiver(post_save, sender=CV)
+def cv_saved(sender, instance, **kwargs):
+    if "parsed_text" in instance.__dict__:
+        repoint("cv", instance.pk, cv_version(instance))
+    else:
+        forget("cv", instance.pk)  # parsed_text di-defer, versi baru belum diketahui
+
+
+@receiver(post_delete, sender=Job)
+def job_deleted(sender, instance, **kwargs):
+    forget("job", instance.pk)
+
+
+@receiver(post_delete, sender=CV)
+def cv_deleted(sender, instance, **kwargs):
+    forget("cv", instance.pk)
@@ -0,0 +1,22 @@
+import tiktoken
+
+# hitung & potong token teks prompt (crawler, chat, CV) dengan encoding model yang dipakai
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    global _encoding
+    try:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding("o200k_base")  # encoding gpt-4o / gpt-4o-mini
+        return len(_encoding.encode(text))
+    except Exception:
+        return len(text) // 4  # perkiraan kasar kalau file encoding tidak bisa di-load
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    if count_tokens(text) <= max_tokens:
+        return text
+    if _encoding is not None:
+        return _encoding.decode(_encoding.encode(text)[:max_tokens])
+    return text[:max_tokens * 4]
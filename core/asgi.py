@@ -1,19 +1,19 @@
-import os
-import django
-from django.core.asgi import get_asgi_application
-from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.auth import AuthMiddlewareStack
-
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
-
-# Setup Django sebelum import apapun yang butuh model
-django.setup()
-
-from core.routing import websocket_urlpatterns
-
-application = ProtocolTypeRouter({
-    "http": get_asgi_application(),
-    "websocket": AuthMiddlewareStack(
-        URLRouter(websocket_urlpatterns)
-    ),
-})
+import os
+import django
+from django.core.asgi import get_asgi_application
+from channels.routing import ProtocolTypeRouter, URLRouter
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+# Setup Django sebelum import apapun yang butuh model
+django.setup()
+
+from core.routing import websocket_urlpatterns
+from core.ws_auth import JWTAuthMiddlewareStack
+
+application = ProtocolTypeRouter({
+    "http": get_asgi_application(),
+    "websocket": JWTAuthMiddlewareStack(
+        URLRouter(websocket_urlpatterns)
+    ),
+})
@@ -1,51 +1,65 @@
-from channels.generic.websocket import AsyncWebsocketConsumer
-import json
-from chats.tasks import process_chat
-from cv.models import CV
-from asgiref.sync import sync_to_async
-
-class NotificationConsumer(AsyncWebsocketConsumer):
-    async def connect(self):
-        await self.accept()
-        await self.channel_layer.group_add(
-            'notification',
-            self.channel_name
-        )
-    async def disconnect(self, close_code):
-        await self.channel_layer.group_discard('notification', self.channel_name)
-
-    async def send_notification(self,event):
-        data = event['data']
-        await self.send(text_data=json.dumps(data))
-
-class ChatConsumer(AsyncWebsocketConsumer):
-    async def connect(self):
-        self.document_id = self.scope['url_route']['kwargs']['document_id']
-        self.group_name = f"chat_{self.document_id}"
-
-        await self.accept()
-        await self.channel_layer.group_add("chat", self.channel_name)
-
-    async def disconnect(self, close_code):
-        await self.channel_layer.group_discard("chat", self.channel_name)
-
-    async def receive(self, text_data):
-        text_data_json = json.loads(text_data)
-        message = text_data_json.get("message")
-        user = self.scope["user"]
-        print('user', user)
-
-        try:
-            cv = await sync_to_async(CV.objects.get)(user_id=user.id)
-            cv_id = cv.id
-        except CV.DoesNotExist:
-            await self.send(text_data=json.dumps({"message": "CV tidak ditemukan untuk user ini."}))
-            return
-
-        process_chat(message, self.document_id, cv_id)
-
-
-
-    async def send_message(self, event):
-        message = event["message"]
-        await self.send(text_data=json.dumps({"message": message}))
+from channels.generic.websocket import AsyncWebsocketConsumer
+import json
+from chats.tasks import process_chat
+from chats.methods import chat_group
+from notifications.methods import BROADCAST_GROUP, user_group
+from cv.models import CV
+from asgiref.sync import sync_to_async
+
+class NotificationConsumer(AsyncWebsocketConsumer):
+    async def connect(self):
+        # notifikasi pipeline dikirim ke group per user; group broadcast hanya untuk pengumuman
+        user = self.scope["user"]
+        self.notification_groups = [BROADCAST_GROUP]
+        if user.is_authenticated:
+            self.notification_groups.append(user_group(user.id))
+        for group in self.notification_groups:
+            await self.channel_layer.group_add(group, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, close_code):
+        for group in self.notification_groups:
+            await self.channel_layer.group_discard(group, self.channel_name)
+
+    async def send_notification(self,event):
+        data = event['data']
+        await self.send(text_data=json.dumps(data))
+
+class ChatConsumer(AsyncWebsocketConsumer):
+    async def connect(self):
+        self.document_id = self.scope['url_route']['kwargs']['document_id']
+        self.group_name = None
+        user = self.scope["user"]
+        if not user.is_authenticated:
+            await self.close()
+            return
+
+        # group per (user, dokumen): balasan tidak ikut terkirim ke socket chat lain
+        self.user_id = user.id
+        self.group_name = chat_group(user.id, self.document_id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, close_code):
+        if self.group_name:
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive(self, text_data):
+        text_data_json = json.loads(text_data)
+        message = text_data_json.get("message")
+
+        try:
+            cv = await sync_to_async(CV.objects.get)(user_id=self.user_id)
+            cv_id = cv.id
+        except CV.DoesNotExist:
+            await self.send(text_data=json.dumps({"message": "CV tidak ditemukan untuk user ini."}))
+            return
+
+        process_chat(message, self.document_id, cv_id, self.user_id)
+
+
+
+    async def send_message(self, event):
+        # {"message"} untuk balasan utuh, atau frame streaming {"event": "delta"/"commit", ...}
+        data = {key: value for key, value in event.items() if key != "type"}
+        await self.send(text_data=json.dumps(data))
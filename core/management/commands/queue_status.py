@@ -0,0 +1,26 @@
+import json
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.queues import queue_depths
+
+
+class Command(BaseCommand):
+    help = "Tampilkan kedalaman tiap queue huey (pending, scheduled, hasil tersimpan) dan jumlah worker-nya."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--json", action="store_true", help="Output JSON (untuk monitoring)")
+
+    def handle(self, *args, **options):
+        depths = queue_depths()
+        for name, depth in depths.items():
+            depth["workers"] = settings.HUEY_QUEUES[name]["workers"]
+
+        if options["json"]:
+            self.stdout.write(json.dumps(depths))
+            return
+
+        self.stdout.write(f"{'queue':<8}{'workers':>9}{'pending':>9}{'scheduled':>11}{'results':>9}")
+        for name, depth in depths.items():
+            self.stdout.write(
+                f"{name:<8}{depth['workers']:>9}{depth['pending']:>9}{depth['scheduled']:>11}{depth['results']:>9}"
+            )
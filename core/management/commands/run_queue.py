@@ -0,0 +1,91 @@
+import os
+import signal
+import logging
+import multiprocessing
+from multiprocessing.connection import wait
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import autodiscover_modules
+from huey.consumer_options import ConsumerConfig
+from core.queues import QUEUES
+
+
+def run_consumer(name, workers=None):
+    options = dict(settings.HUEY_QUEUES[name])
+    if workers:
+        options["workers"] = workers
+    config = ConsumerConfig(**options)
+    config.validate()
+
+    logger = logging.getLogger("huey")
+    if not logger.handlers:
+        config.setup_logger(logger)
+    logger.info(f"🚦 Queue {name}: {config.workers} {config.worker_type} worker(s)")
+    QUEUES[name].create_consumer(**config.values).run()
+
+
+def run_consumer_process(name):
+    # entry point proses anak (spawn): Django & task di-setup ulang di proses baru
+    import django
+    django.setup()
+    autodiscover_modules("tasks", "task")
+    run_consumer(name)
+
+
+class Command(BaseCommand):
+    help = "Jalankan consumer huey untuk queue chat/cv/crawl; tiap queue punya worker pool sendiri."
+
+    def add_arguments(self, parser):
+        parser.add_argument("queues", nargs="*", help=f"Nama queue ({', '.join(QUEUES)}), default semua")
+        parser.add_argument("-w", "--workers", type=int, help="Override jumlah worker (hanya untuk satu queue)")
+
+    def handle(self, *args, **options):
+        names = options["queues"] or list(QUEUES)
+        unknown = [name for name in names if name not in QUEUES]
+        if unknown:
+            raise CommandError(f"Unknown queue: {', '.join(unknown)} (choose from {', '.join(QUEUES)})")
+        if options["workers"] and len(names) > 1:
+            raise CommandError("--workers can only be used with a single queue")
+
+        # task terdaftar ke queue saat module-nya di-import (app kita memakai tasks.py dan task.py)
+        autodiscover_modules("tasks", "task")
+
+        if len(names) == 1:
+            run_consumer(names[0], options["workers"])
+            return
+
+        # beberapa queue dalam satu container: satu proses consumer per queue. spawn, bukan fork:
+        # setelah django.setup() sudah ada koneksi terbuka (httpx keep-alive ke Chroma dari
+        # core/ai/chromadb.py, client Redis cache/huey) yang tidak boleh dipakai bersama antar proses
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=run_consumer_process, args=(name,), name=f"huey-{name}") for name in names
+        ]
+        for process in processes:
+            process.start()
+
+        stopping = []
+
+        def forward(signum, frame):
+            # cukup sekali: sinyal kedua bisa datang setelah huey mengembalikan handler default
+            if stopping:
+                return
+            stopping.append(signum)
+            for process in processes:
+                if process.is_alive():
+                    os.kill(process.pid, signum)
+
+        signal.signal(signal.SIGINT, forward)
+        signal.signal(signal.SIGTERM, forward)
+
+        # kalau satu consumer mati, hentikan semua supaya container di-restart utuh
+        wait([process.sentinel for process in processes])
+        forward(signal.SIGTERM, None)
+        for process in processes:
+            process.join()
+
+        # consumer yang berhenti karena SIGTERM/SIGINT (mis. dikirim ke seluruh process group) bukan error
+        stopped = (0, -signal.SIGTERM, -signal.SIGINT)
+        failed = [process.name for process in processes if process.exitcode not in stopped]
+        if failed:
+            raise CommandError(f"Consumer exited with error: {', '.join(failed)}")
@@ -0,0 +1,43 @@
+from django.conf import settings
+from huey import PriorityRedisHuey
+
+# Satu queue huey per jenis beban, masing-masing dikonsumsi worker pool sendiri
+# (python manage.py run_queue <nama>), supaya crawl batch yang lama tidak
+# mengantri di depan chat/CV user. Di dalam satu queue task diurutkan per priority
+# (angka lebih besar dikerjakan lebih dulu).
+#   chat  : balasan chat & notifikasi realtime
+#   cv    : pipeline CV (OCR -> analisa -> matching)
+#   crawl : crawling lowongan terjadwal
+PRIORITY_HIGH = 10
+PRIORITY_NORMAL = 0
+
+
+def make_queue(name):
+    return PriorityRedisHuey(
+        f"{settings.HUEY_NAME}-{name}",
+        url=settings.HUEY_URL,
+        immediate=settings.DEBUG,
+    )
+
+
+chat_queue = make_queue("chat")
+cv_queue = make_queue("cv")
+crawl_queue = make_queue("crawl")
+
+QUEUES = {
+    "chat": chat_queue,
+    "cv": cv_queue,
+    "crawl": crawl_queue,
+}
+
+
+def queue_depths():
+    """Jumlah task pending/scheduled dan hasil yang belum diambil untuk tiap queue."""
+    return {
+        name: {
+            "pending": queue.pending_count(),
+            "scheduled": queue.scheduled_count(),
+            "results": queue.result_count(),
+        }
+        for name, queue in QUEUES.items()
+    }
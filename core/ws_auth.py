@@ -0,0 +1,37 @@
+from urllib.parse import parse_qs
+from channels.auth import AuthMiddlewareStack
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+jwt_authentication = JWTAuthentication()
+
+
+@database_sync_to_async
+def get_user_from_token(raw_token):
+    try:
+        validated_token = jwt_authentication.get_validated_token(raw_token)
+        return jwt_authentication.get_user(validated_token)
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return None
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """
+    Isi scope["user"] dari access token JWT di query string (ws/...?token=<access>),
+    karena login API memakai JWT, bukan session. Tanpa token tetap memakai user session.
+    """
+
+    async def __call__(self, scope, receive, send):
+        token = parse_qs(scope.get("query_string", b"").decode()).get("token")
+        if token:
+            user = await get_user_from_token(token[0])
+            if user is not None:
+                scope = dict(scope, user=user)
+        return await super().__call__(scope, receive, send)
+
+
+def JWTAuthMiddlewareStack(inner):
+    return AuthMiddlewareStack(JWTAuthMiddleware(inner))
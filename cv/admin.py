@@ -1,9 +1,14 @@
-from django.contrib import admin
-from .models import CV
-
-@admin.register(CV)
-class CVAdmin(admin.ModelAdmin):
-    list_display = ('id', 'user_id', 'uploaded_at')
-    list_filter = ('uploaded_at',)
-    search_fields = ('id', 'user_id')
-    readonly_fields = ('id', 'uploaded_at')
\ No newline at end of file
+from django.contrib import admin
+from .models import CV, OCRCache
+
+@admin.register(CV)
+class CVAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user_id', 'uploaded_at')
+    list_filter = ('uploaded_at',)
+    search_fields = ('id', 'user_id')
+    readonly_fields = ('id', 'uploaded_at')
+
+@admin.register(OCRCache)
+class OCRCacheAdmin(admin.ModelAdmin):
+    list_display = ('file_hash', 'size', 'created_at', 'last_used_at')
+    search_fields = ('file_hash',)
\ No newline at end of file
@@ -1,6 +1,6 @@
-from django.apps import AppConfig
-
-
-class CvConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'cv'
+from django.apps import AppConfig
+
+
+class CvConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'cv'
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-19 19:01
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cv', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OCRCache',
+            fields=[
+                ('file_hash', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('markdown', models.TextField()),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(default=datetime.datetime.now)),
+                ('last_used_at', models.DateTimeField(db_index=True, default=datetime.datetime.now)),
+            ],
+        ),
+    ]
@@ -1,77 +1,128 @@
-from django.db import models
-import re
-
-class CV(models.Model):
-    CATEGORY_CHOICES = [
-        ('teknologi', 'Teknologi'),
-        ('bisnis_manajemen', 'Bisnis dan Manajemen'),
-        ('kreatif', 'Kreatif'),
-        ('industri_manufaktur', 'Industri dan Manufaktur'),
-    ]
-
-    STATUS_CHOICES = [
-        ('pending', 'Pending'),
-        ('processing', 'Processing'),
-        ('completed', 'Completed'),
-        ('failed', 'Failed'),
-    ]
-    user_id = models.CharField(max_length=255, unique=True)
-    file_url = models.CharField(max_length=255)
-    parsed_text = models.TextField(blank=True, null=True)
-    category = models.CharField(max_length=50, choices=CATEGORY_CHOICES, default='Uncategorized')
-    uploaded_at = models.DateTimeField(auto_now_add=True)
-    status = models.CharField(choices=STATUS_CHOICES, default='pending', max_length=20)
-
-    def __str__(self):
-        return f"CV {self.id} - {self.user_id}"
-    
-    def categorize_cv(self):
-        if not self.parsed_text:
-            return 'uncategorized'
-        
-        text_lower = self.parsed_text.lower()
-        
-        categories = {
-            "teknologi": [
-                "software engineer", "devops engineer", "data scientist",
-                "cybersecurity analyst", "qa engineer", "ui/ux designer", "cloud engineer",
-                "backend", "frontend", "full stack", "mobile developer", "machine learning", 
-                "data analyst", "qa tester", "developer", "programmer", "python", "java", 
-                "javascript", "react", "node.js", "database", "sql", "api"
-            ],
-            "bisnis_manajemen": [
-                "business analyst", "project manager", "product manager",
-                "hr specialist", "recruiter", "marketing specialist", "digital marketing",
-                "finance analyst", "accountant", "manager", "analyst", "consultant",
-                "coordinator", "supervisor", "leader", "management"
-            ],
-            "kreatif": [
-                "graphic designer", "ui designer", "content writer", "copywriter",
-                "video editor", "social media specialist", "brand strategist",
-                "designer", "creative", "photoshop", "illustrator", "figma", "canva"
-            ],
-            "industri_manufaktur": [
-                "mechanical engineer", "industrial engineer", "supply chain analyst",
-                "procurement specialist", "quality assurance engineer", "qa manufaktur", 
-                "qa logistik", "engineer", "manufacturing", "production", "operations",
-                "logistics", "warehouse", "inventory"
-            ]
-        }
-        
-        # score keyword matches
-        category_scores = {}
-        for category, keywords in categories.items():
-            score = 0
-            for keyword in keywords:
-                if re.search(r'\b' + re.escape(keyword) + r'\b', text_lower):
-                    score += 1
-            category_scores[category] = score
-        
-        # find highest score
-        if max(category_scores.values()) > 0:
-            return max(category_scores, key=category_scores.get)
-    
-    def save(self, *args, **kwargs):
-        if self.parsed_text and not kwargs.get('skip_categorization', False):
-            self.category = self.categorize_cv()
-        super().save(*args, **kwargs)
\ No newline at end of file
+from django.db import models
+from datetime import datetime
+import re
+
+CATEGORY_KEYWORDS = {
+    "teknologi": [
+        "software engineer", "devops engineer", "data scientist",
+        "cybersecurity analyst", "qa engineer", "ui/ux designer", "cloud engineer",
+        "backend", "frontend", "full stack", "mobile developer", "machine learning",
+        "data analyst", "qa tester", "developer", "programmer", "python", "java",
+        "javascript", "react", "node.js", "database", "sql", "api"
+    ],
+    "bisnis_manajemen": [
+        "business analyst", "project manager", "product manager",
+        "hr specialist", "recruiter", "marketing specialist", "digital marketing",
+        "finance analyst", "accountant", "manager", "analyst", "consultant",
+        "coordinator", "supervisor", "leader", "management"
+    ],
+    "kreatif": [
+        "graphic designer", "ui designer", "content writer", "copywriter",
+        "video editor", "social media specialist", "brand strategist",
+        "designer", "creative", "photoshop", "illustrator", "figma", "canva"
+    ],
+    "industri_manufaktur": [
+        "mechanical engineer", "industrial engineer", "supply chain analyst",
+        "procurement specialist", "quality assurance engineer", "qa manufaktur",
+        "qa logistik", "engineer", "manufacturing", "production", "operations",
+        "logistics", "warehouse", "inventory"
+    ]
+}
+
+KEYWORD_CATEGORY = {
+    keyword: category for category, keywords in CATEGORY_KEYWORDS.items() for keyword in keywords
+}
+
+# semua keyword dalam satu regex, di-scan sekali per CV. Lookahead di tiap batas kata supaya
+# keyword yang tumpang tindih ("software engineer" dan "engineer") tetap terhitung semua
+KEYWORD_RE = re.compile(
+    r'\b(?=(' + '|'.join(re.escape(k) for k in sorted(KEYWORD_CATEGORY, key=len, reverse=True)) + r')\b)'
+)
+
+# lookahead hanya menangkap satu keyword per posisi; kalau ada keyword yang merupakan awal
+# keyword lain per kata (mis. "qa" dan "qa engineer"), keyword pendeknya ikut dihitung
+KEYWORD_PREFIXES = {
+    keyword: [
+        other for other in KEYWORD_CATEGORY
+        if other == keyword or (keyword.startswith(other) and re.match(r'\W', keyword[len(other)]))
+    ]
+    for keyword in KEYWORD_CATEGORY
+}
+
+
+class CV(models.Model):
+    CATEGORY_CHOICES = [
+        ('teknologi', 'Teknologi'),
+        ('bisnis_manajemen', 'Bisnis dan Manajemen'),
+        ('kreatif', 'Kreatif'),
+        ('industri_manufaktur', 'Industri dan Manufaktur'),
+    ]
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    user_id = models.CharField(max_length=255, unique=True)
+    file_url = models.CharField(max_length=255)
+    parsed_text = models.TextField(blank=True, null=True)
+    category = models.CharField(max_length=50, choices=CATEGORY_CHOICES, default='Uncategorized')
+    uploaded_at = models.DateTimeField(auto_now_add=True)
+    status = models.CharField(choices=STATUS_CHOICES, default='pending', max_length=20)
+
+    _saved_parsed_text = None
+
+    def __str__(self):
+        return f"CV {self.id} - {self.user_id}"
+    
+    def categorize_cv(self):
+        if not self.parsed_text:
+            return 'uncategorized'
+
+        # score keyword matches (jumlah keyword berbeda yang muncul per kategori)
+        found = set()
+        for match in KEYWORD_RE.finditer(self.parsed_text.lower()):
+            found.update(KEYWORD_PREFIXES[match.group(1)])
+
+        category_scores = {category: 0 for category in CATEGORY_KEYWORDS}
+        for keyword in found:
+            category_scores[KEYWORD_CATEGORY[keyword]] += 1
+
+        # find highest score
+        if max(category_scores.values()) > 0:
+            return max(category_scores, key=category_scores.get)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # parsed_text terakhir yang tersimpan, untuk cek perlu kategorisasi ulang atau tidak
+        instance._saved_parsed_text = instance.__dict__.get('parsed_text')
+        return instance
+
+    def parsed_text_changed(self):
+        # field yang di-defer (tidak ada di __dict__) dan tidak disentuh berarti tidak berubah
+        if 'parsed_text' not in self.__dict__:
+            return False
+        return self.parsed_text != self._saved_parsed_text
+
+    def save(self, *args, **kwargs):
+        skip_categorization = kwargs.pop('skip_categorization', False)
+        # save yang hanya mengubah status dll tidak perlu kategorisasi ulang
+        if not skip_categorization and self.parsed_text_changed() and self.parsed_text:
+            self.category = self.categorize_cv()
+        super().save(*args, **kwargs)
+        self._saved_parsed_text = self.__dict__.get('parsed_text')
+
+
+class OCRCache(models.Model):
+    """Hasil OCR (markdown semua halaman) per isi file, supaya file yang sama tidak di-OCR ulang."""
+
+    file_hash = models.CharField(max_length=64, primary_key=True)  # sha256 isi file
+    markdown = models.TextField()
+    size = models.PositiveIntegerField(default=0)  # ukuran markdown dalam byte, untuk batas ukuran cache
+    created_at = models.DateTimeField(default=datetime.now)
+    last_used_at = models.DateTimeField(default=datetime.now, db_index=True)
+
+    def __str__(self):
+        return f"OCR {self.file_hash[:12]} ({self.size} bytes)"
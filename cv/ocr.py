@@ -0,0 +1,180 @@
+import os
+import time
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from django.db.models import Sum
+from pypdf import PdfReader
+from core.ai.mistral import mistral_client
+from cv.models import OCRCache
+from cv.text_layer import extract_text_layer
+from cv.storage import stored_file_hash
+from core.ai.tokens import count_tokens, truncate_tokens
+
+logger = logging.getLogger(__name__)
+
+OCR_MODEL = "mistral-ocr-2505"
+OCR_CACHE_TTL_DAYS = int(os.getenv("CV_OCR_CACHE_TTL_DAYS", 30))
+OCR_CACHE_MAX_MB = float(os.getenv("CV_OCR_CACHE_MAX_MB", 200))  # total ukuran markdown yang disimpan
+
+# PDF panjang (portfolio, lampiran sertifikat) di-OCR per rentang halaman secara paralel,
+# hanya sampai OCR_MAX_PAGES halaman pertama, dan berhenti lebih awal kalau teks yang
+# terkumpul sudah mencapai CV_MAX_TOKENS (batas teks CV yang masuk ke prompt)
+OCR_MAX_PAGES = int(os.getenv("CV_OCR_MAX_PAGES", 6))
+OCR_PAGES_PER_REQUEST = int(os.getenv("CV_OCR_PAGES_PER_REQUEST", 1))
+OCR_WORKERS = int(os.getenv("CV_OCR_WORKERS", 4))
+CV_MAX_TOKENS = int(os.getenv("CV_MAX_TOKENS", 6000))
+
+
+def file_sha256(file_path, chunk_size=1024 * 1024):
+    sha = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def get_cached_ocr(file_hash):
+    expire_before = datetime.now() - timedelta(days=OCR_CACHE_TTL_DAYS)
+    entry = OCRCache.objects.filter(file_hash=file_hash, created_at__gte=expire_before).first()
+    if entry is None:
+        return None
+    OCRCache.objects.filter(file_hash=file_hash).update(last_used_at=datetime.now())
+    return entry.markdown
+
+
+def store_ocr(file_hash, markdown):
+    now = datetime.now()
+    OCRCache.objects.update_or_create(
+        file_hash=file_hash,
+        defaults={
+            "markdown": markdown,
+            "size": len(markdown.encode("utf-8")),
+            "created_at": now,
+            "last_used_at": now,
+        },
+    )
+    evict_ocr_cache()
+
+
+def evict_ocr_cache():
+    """Buang entry yang lewat TTL, lalu entry yang paling lama tidak dipakai sampai di bawah batas ukuran."""
+    expire_before = datetime.now() - timedelta(days=OCR_CACHE_TTL_DAYS)
+    OCRCache.objects.filter(created_at__lt=expire_before).delete()
+
+    max_bytes = OCR_CACHE_MAX_MB * 1024 * 1024
+    total = OCRCache.objects.aggregate(total=Sum("size"))["total"] or 0
+    if total <= max_bytes:
+        return
+
+    evicted = []
+    for file_hash, size in OCRCache.objects.order_by("last_used_at").values_list("file_hash", "size").iterator():
+        if total <= max_bytes:
+            break
+        evicted.append(file_hash)
+        total -= size
+    OCRCache.objects.filter(file_hash__in=evicted).delete()
+    logger.info(f"🧹 Evicted {len(evicted)} OCR cache entries")
+
+
+def count_pdf_pages(file_path):
+    if not file_path.lower().endswith(".pdf"):
+        return None
+    try:
+        return len(PdfReader(file_path).pages)
+    except Exception:
+        return None
+
+
+def ocr_page_range(document, pages):
+    start = time.perf_counter()
+    options = {"pages": pages} if pages is not None else {}
+    response = mistral_client.ocr.process(model=OCR_MODEL, document=document, **options)
+    markdowns = [page.markdown for page in sorted(response.pages, key=lambda page: page.index)]
+    return markdowns, time.perf_counter() - start
+
+
+def run_mistral_ocr(file_path):
+    # upload sekali -> signed url -> OCR per rentang halaman (paralel), markdown digabung
+    with open(file_path, "rb") as file_content:
+        uploaded_file = mistral_client.files.upload(
+            file={
+                "file_name": os.path.basename(file_path),
+                "content": file_content,
+            },
+            purpose="ocr"
+        )
+    signed_url = mistral_client.files.get_signed_url(file_id=uploaded_file.id)
+    document = {"type": "document_url", "document_url": signed_url.url}
+
+    page_count = count_pdf_pages(file_path)
+    if page_count is None:
+        # DOCX / PDF yang jumlah halamannya tidak terbaca: satu request, ambil halaman awal saja
+        markdowns, elapsed = ocr_page_range(document, None)
+        logger.info(f"📄 OCR {os.path.basename(file_path)}: {len(markdowns)} pages in {elapsed:.1f}s")
+        return "\n\n".join(markdowns[:OCR_MAX_PAGES])
+
+    pages = list(range(min(page_count, OCR_MAX_PAGES)))
+    if page_count > OCR_MAX_PAGES:
+        logger.info(f"✂️ {os.path.basename(file_path)} has {page_count} pages, OCR only the first {OCR_MAX_PAGES}")
+    page_ranges = [pages[i:i + OCR_PAGES_PER_REQUEST] for i in range(0, len(pages), OCR_PAGES_PER_REQUEST)]
+
+    start = time.perf_counter()
+    executor = ThreadPoolExecutor(max_workers=OCR_WORKERS)
+    futures = [executor.submit(ocr_page_range, document, page_range) for page_range in page_ranges]
+    markdowns, tokens = [], 0
+    try:
+        # hasil diproses berurutan per halaman; rentang berikutnya yang belum jalan dibatalkan
+        # begitu token cukup
+        for page_range, future in zip(page_ranges, futures):
+            range_markdowns, elapsed = future.result()
+            for index, markdown in zip(page_range, range_markdowns):
+                page_tokens = count_tokens(markdown)
+                tokens += page_tokens
+                markdowns.append(markdown)
+                logger.info(
+                    f"📄 OCR page {index + 1}/{page_count}: {elapsed / len(page_range):.1f}s, {page_tokens} tokens"
+                )
+            if tokens >= CV_MAX_TOKENS:
+                skipped = sum(future.cancel() for future in futures)
+                logger.info(f"⏹️ OCR stopped early at {tokens} tokens, {skipped} page request(s) cancelled")
+                break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    logger.info(
+        f"📄 OCR {os.path.basename(file_path)}: {len(markdowns)}/{page_count} pages, {tokens} tokens "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+    return "\n\n".join(markdowns)
+
+
+def cap_cv_text(text, file_path):
+    """Batasi teks CV ke CV_MAX_TOKENS supaya tidak membanjiri prompt AnalyzeCV/matching/chat."""
+    capped = truncate_tokens(text, CV_MAX_TOKENS)
+    if len(capped) < len(text):
+        logger.info(f"✂️ CV text {os.path.basename(file_path)} truncated to {CV_MAX_TOKENS} tokens")
+    return capped
+
+
+def extract_cv_markdown(file_path):
+    """
+    Teks/markdown isi CV. Urutannya: text layer lokal (PDF/DOCX digital, tanpa upload),
+    lalu cache OCR per isi file (re-upload, retry), baru OCR Mistral. Hasilnya dibatasi
+    CV_MAX_TOKENS.
+    """
+    text = extract_text_layer(file_path)
+    if text is not None:
+        return cap_cv_text(text, file_path)
+
+    # nama file upload sudah sha256 isinya; baca ulang file hanya untuk file lama
+    file_hash = stored_file_hash(file_path) or file_sha256(file_path)
+    markdown = get_cached_ocr(file_hash)
+    if markdown is not None:
+        logger.info(f"♻️ OCR cache hit for {os.path.basename(file_path)} ({file_hash[:12]})")
+        return cap_cv_text(markdown, file_path)
+
+    markdown = run_mistral_ocr(file_path)
+    store_ocr(file_hash, markdown)
+    return cap_cv_text(markdown, file_path)
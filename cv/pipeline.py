@@ -0,0 +1,57 @@
+import os
+import logging
+from contextlib import contextmanager
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Setiap upload CV mendapat token baru per user (INCR di Redis). Task process_cv dan
+# job_matching membawa token itu dan mengecek di tiap batas tahap (sebelum OCR, LLM,
+# dan sebelum menulis ke database) apakah masih yang terbaru; kalau sudah ada upload
+# yang lebih baru, pekerjaan lama berhenti supaya OCR/LLM tidak dibayar dua kali.
+# Penulisan hasil (CV & JobRecommendation) dilakukan di bawah lock per user.
+PIPELINE_TTL = int(os.getenv("CV_PIPELINE_TTL", 24 * 3600))
+LOCK_TIMEOUT = int(os.getenv("CV_PIPELINE_LOCK_TIMEOUT", 120))
+LOCK_WAIT = int(os.getenv("CV_PIPELINE_LOCK_WAIT", 60))
+
+redis_client = redis.Redis.from_url(settings.HUEY_URL)
+
+
+class Superseded(Exception):
+    """Ada upload CV yang lebih baru untuk user ini, hasil pekerjaan ini akan dibuang."""
+
+
+def token_key(user_id):
+    return f"cv-pipeline:{user_id}:token"
+
+
+def start_pipeline(user_id):
+    """Daftarkan upload baru untuk user ini, pipeline yang sedang jalan jadi usang."""
+    key = token_key(user_id)
+    pipe = redis_client.pipeline()
+    pipe.incr(key)
+    pipe.expire(key, PIPELINE_TTL)
+    token, _ = pipe.execute()
+    return token
+
+
+def is_current(user_id, token):
+    if token is None:  # dipanggil tanpa token (mis. dari shell), tidak dicek
+        return True
+    current = redis_client.get(token_key(user_id))
+    return current is None or int(current) == token
+
+
+def ensure_current(user_id, token, stage):
+    if not is_current(user_id, token):
+        logger.info(f"⏭️ Pipeline CV user {user_id} (token {token}) digantikan upload baru, berhenti sebelum {stage}")
+        raise Superseded(stage)
+
+
+@contextmanager
+def user_lock(user_id, token, stage):
+    """Lock per user untuk menulis hasil; token dicek ulang setelah lock didapat."""
+    with redis_client.lock(f"cv-pipeline:{user_id}:lock", timeout=LOCK_TIMEOUT, blocking_timeout=LOCK_WAIT):
+        ensure_current(user_id, token, stage)
+        yield
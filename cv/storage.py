@@ -0,0 +1,92 @@
+import os
+import re
+import time
+import uuid
+import hashlib
+from django.conf import settings
+
+MAX_UPLOAD_MB = float(os.getenv("CV_MAX_UPLOAD_MB", 10))
+MAX_UPLOAD_BYTES = int(MAX_UPLOAD_MB * 1024 * 1024)
+CV_DIR = "cv_files"
+HASH_NAME_RE = re.compile(r'^([0-9a-f]{64})\.[a-z0-9]+$')
+# file yang tidak dipakai CV mana pun baru dihapus setelah tidak disentuh selama ini
+# (upload yang sedang berjalan bisa sudah menyimpan/memakai ulang file tapi belum membuat CV-nya)
+FILE_GC_GRACE_HOURS = float(os.getenv("CV_FILE_GC_GRACE_HOURS", 24))
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+def save_upload(uploaded_file):
+    """
+    Simpan file upload per chunk ke storage content-addressed (media/cv_files/<sha256>.<ext>)
+    sambil menghitung sha256, tanpa memuat seluruh isi file ke memori. File yang isinya sama
+    hanya disimpan sekali. Return (absolute_path, sha256).
+    """
+    if uploaded_file.size and uploaded_file.size > MAX_UPLOAD_BYTES:
+        raise UploadTooLarge(f"File is larger than {MAX_UPLOAD_MB:g} MB")
+
+    directory = os.path.join(settings.MEDIA_ROOT, CV_DIR)
+    os.makedirs(directory, exist_ok=True)
+    extension = os.path.splitext(uploaded_file.name)[1].lower()
+
+    # tulis ke file sementara di folder yang sama, lalu rename (atomic) setelah hash diketahui
+    temp_path = os.path.join(directory, f".upload-{uuid.uuid4()}{extension}")
+    sha = hashlib.sha256()
+    written = 0
+    try:
+        with open(temp_path, "wb") as destination:
+            for chunk in uploaded_file.chunks():
+                written += len(chunk)
+                if written > MAX_UPLOAD_BYTES:
+                    raise UploadTooLarge(f"File is larger than {MAX_UPLOAD_MB:g} MB")
+                sha.update(chunk)
+                destination.write(chunk)
+
+        file_hash = sha.hexdigest()
+        final_path = os.path.join(directory, f"{file_hash}{extension}")
+        if os.path.exists(final_path):
+            os.remove(temp_path)  # isi sama sudah tersimpan
+            os.utime(final_path)  # dipakai lagi, jangan dihapus remove_unreferenced_files
+        else:
+            os.replace(temp_path, final_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return final_path, file_hash
+
+
+def stored_file_hash(file_path):
+    """sha256 isi file dari nama file content-addressed (save_upload), None untuk file lama."""
+    match = HASH_NAME_RE.match(os.path.basename(file_path or ""))
+    return match.group(1) if match else None
+
+def remove_unreferenced_files(referenced_paths):
+    """
+    Hapus file di media/cv_files yang tidak dipakai CV mana pun dan sudah lebih lama dari
+    grace period (termasuk file .upload- sementara yang tertinggal). File tidak dihapus saat
+    CV diganti karena file content-addressed bisa sedang dipakai ulang upload lain.
+    Return jumlah file yang dihapus.
+    """
+    directory = os.path.join(settings.MEDIA_ROOT, CV_DIR)
+    if not os.path.isdir(directory):
+        return 0
+
+    referenced = {os.path.basename(path) for path in referenced_paths if path}
+    cutoff = time.time() - FILE_GC_GRACE_HOURS * 3600
+    removed = 0
+    for entry in os.scandir(directory):
+        if not entry.is_file() or entry.name in referenced:
+            continue
+        try:
+            # stat ulang (bukan cache scandir): upload barusan me-refresh mtime file yang dipakai ulang
+            if os.stat(entry.path).st_mtime > cutoff:
+                continue
+            os.remove(entry.path)
+            removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
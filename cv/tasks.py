@@ -1,138 +1,184 @@
-from cv.models import CV  # di awal, biar tidak di dalam fungsi
-from django.contrib.auth import get_user_model
-from notifications.methods import send_notification
-from core.ai.mistral import mistral_client
-from core.ai.pm import PromptManager
-from cv.utils import clean_cv_text
-from huey.contrib.djhuey import task
-from dotenv import load_dotenv
-from matching.task import job_matching
-from pydantic import BaseModel, Field
-from typing import List, Literal
-import os
-
-load_dotenv()
-
-CategoryLiteral = Literal["Teknologi", "Bisnis dan Manajemen", "Kreatif", "Industri dan Manufaktur", "None"]
-
-class AnalyzeCV(BaseModel):
-    category: CategoryLiteral = Field(
-        ..., 
-        description="Kategori Pekerjaan, harus salah satu dari: Teknologi, Bisnis dan Manajemen, Kreatif, Industri dan Manufaktur"
-    )
-    skills: str = Field(description="skill yang ada pada cv")
-    is_CV: bool = Field(description="tentukan apakah dokumen tersebut adalah CV atau bukan, CV memiliki strukur: informasi pribadi, ringkasan profil, riwayat pendidikan, pengalaman kerja, keahlian, dan sertifikasi/pelatihan.")
-    experience: str = Field(description="pengalaman kerja atau proyek yang ada pada cv, bisa juga pengalaman organisasi")
-
-
-@task()
-def process_cv(cv_id):
-    try:
-        cv = CV.objects.get(id=cv_id)
-    except CV.DoesNotExist:
-        print(f"CV with ID {cv_id} not found.")
-        return False
-
-    try:
-        cv.status = "processing"
-        cv.save()
-
-        send_notification({
-            "type": "info",
-            "title": "🔎 Mulai Memproses",
-            "message": "Kami sedang menganalisis CV Anda dan mencari lowongan pekerjaan yang paling cocok..."
-        })
-
-        file_path = cv.file_url
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        # Upload dan OCR
-        with open(file_path, "rb") as file_content:
-            uploaded_file = mistral_client.files.upload(
-                file={
-                    "file_name": os.path.basename(file_path),
-                    "content": file_content,
-                },
-                purpose="ocr"
-            )
-        signed_url = mistral_client.files.get_signed_url(file_id=uploaded_file.id)
-        ocr_response = mistral_client.ocr.process(
-            model="mistral-ocr-2505",
-            document={"type": "document_url", "document_url": signed_url.url}
-        )
-
-        parsed_text = "\n\n".join(page.markdown for page in ocr_response.pages)
-        cleaned_text = clean_cv_text(parsed_text)
-
-        # Analisis AI
-        pm = PromptManager()
-        pm.add_message("system", f"""
-            Kamu adalah asisten rekrutmen profesional.
-
-            Tugasmu adalah menentukan apakah **dokumen yang diberikan benar-benar merupakan CV (Curriculum Vitae)** atau **bukan**.
-
-            ### Definisi CV yang Sah:
-            CV wajib berisi sebagian besar dari elemen-elemen berikut ini:
-            - Informasi pribadi
-            - Ringkasan profil atau tujuan karier
-            - Riwayat pendidikan
-            - Pengalaman kerja
-            - Daftar keterampilan
-            - Sertifikasi/pelatihan (opsional)
-
-            Jika hanya berupa identitas seperti KTP, SIM, atau cover letter → bukan CV.
-
-            Dokumen:
-            {cleaned_text}
-        """)
-        pm.add_message("user", "Tolong kembalikan struktur data CV yang dianalisis.")
-        result = pm.generate_structure(AnalyzeCV)
-
-        is_cv = result["is_CV"]
-        category = result["category"] or "None"  # Jaga-jaga agar tidak None
-        skills = result["skills"]
-        experience = result['experience']
-
-        # Tangani dokumen bukan CV
-        if not is_cv:
-            send_notification({
-                "type": "error",
-                "title": "❌ Dokumen Tidak Valid",
-                "message": "Dokumen yang diunggah bukan CV atau tidak dapat dianalisis. Silakan unggah ulang dokumen Anda."
-            })
-            return False
-
-        # Jika CV valid
-        cv.parsed_text = cleaned_text
-        cv.category = category
-        cv.status = "completed"
-        cv.save()
-
-        user = get_user_model().objects.get(id=cv.user_id)
-        job_matching(user, cv.id, skills, experience)
-
-        print("CV processed successfully")
-        return True
-
-    except Exception as e:
-        print(f"Error processing CV {cv_id}: {str(e)}")
-
-        if cv:
-            try:
-                if not cv.category or cv.category is None:
-                    cv.category = "None"  # <- pastikan kategori aman
-                if not cv.parsed_text:
-                    cv.parsed_text = ""  # <- biar aman juga
-                cv.status = "failed"
-                cv.save()
-
-                send_notification({
-                    "type": "error",
-                    "title": "❌ Gagal Memproses",
-                    "message": "Gagal mengunggah atau memproses CV Anda. Silakan coba kembali."
-                })
-            except Exception as save_error:
-                print(f"❗ Gagal menyimpan status gagal: {str(save_error)}")
-
-        raise e
+from cv.models import CV  # di awal, biar tidak di dalam fungsi
+from django.contrib.auth import get_user_model
+from notifications.methods import send_notification
+from core.ai.pm import PromptManager
+from cv.utils import clean_cv_text
+from cv.ocr import extract_cv_markdown
+from cv.pipeline import Superseded, ensure_current, user_lock
+from cv.storage import remove_unreferenced_files
+from core.queues import cv_queue
+from huey import crontab
+from dotenv import load_dotenv
+from matching.task import job_matching, retrieve_jobs
+from pydantic import BaseModel, Field
+from typing import List, Literal
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+load_dotenv()
+
+# retrieval Chroma (embedding CV + query) dimulai bersamaan dengan AnalyzeCV memakai tebakan
+# kategori dari keyword scorer lokal; hasilnya dipakai kalau kategori dari LLM sama
+SPECULATIVE_RETRIEVAL = os.getenv("CV_SPECULATIVE_RETRIEVAL", "true").lower() == "true"
+speculation_executor = ThreadPoolExecutor(max_workers=int(os.getenv("CV_SPECULATION_WORKERS", 4)))
+
+CategoryLiteral = Literal["Teknologi", "Bisnis dan Manajemen", "Kreatif", "Industri dan Manufaktur", "None"]
+
+class AnalyzeCV(BaseModel):
+    category: CategoryLiteral = Field(
+        ..., 
+        description="Kategori Pekerjaan, harus salah satu dari: Teknologi, Bisnis dan Manajemen, Kreatif, Industri dan Manufaktur"
+    )
+    skills: str = Field(description="skill yang ada pada cv")
+    is_CV: bool = Field(description="tentukan apakah dokumen tersebut adalah CV atau bukan, CV memiliki strukur: informasi pribadi, ringkasan profil, riwayat pendidikan, pengalaman kerja, keahlian, dan sertifikasi/pelatihan.")
+    experience: str = Field(description="pengalaman kerja atau proyek yang ada pada cv, bisa juga pengalaman organisasi")
+
+
+def start_speculative_retrieval(cleaned_text):
+    if not SPECULATIVE_RETRIEVAL:
+        return None, None
+    guess = dict(CV.CATEGORY_CHOICES).get(CV(parsed_text=cleaned_text).categorize_cv())
+    if guess is None:
+        return None, None
+    return guess, speculation_executor.submit(retrieve_jobs, guess, cleaned_text)
+
+
+def speculative_documents(guess, future, category):
+    if future is None:
+        return None
+    if guess != category:
+        print(f"Speculative retrieval miss: guessed '{guess}', AnalyzeCV said '{category}'")
+        return None
+    try:
+        return future.result()
+    except Exception as e:
+        print(f"Speculative retrieval failed, job_matching will query again: {str(e)}")
+        return None
+
+
+@cv_queue.task()
+def process_cv(cv_id, token=None):
+    # token: dari cv.pipeline.start_pipeline saat upload, dicek di tiap tahap supaya
+    # upload yang lebih baru menghentikan pekerjaan ini
+    try:
+        cv = CV.objects.get(id=cv_id)
+    except CV.DoesNotExist:
+        print(f"CV with ID {cv_id} not found.")
+        return False
+
+    retrieval = None
+    try:
+        ensure_current(cv.user_id, token, "OCR")
+        cv.status = "processing"
+        cv.save(update_fields=["status"])  # update_fields: tidak membuat ulang CV yang sudah dihapus upload baru
+
+        send_notification(cv.user_id, {
+            "type": "info",
+            "title": "🔎 Mulai Memproses",
+            "message": "Kami sedang menganalisis CV Anda dan mencari lowongan pekerjaan yang paling cocok..."
+        })
+
+        file_path = cv.file_url
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        # OCR (pakai cache kalau isi file sama pernah diproses)
+        parsed_text = extract_cv_markdown(file_path)
+        ensure_current(cv.user_id, token, "AnalyzeCV")
+        cleaned_text = clean_cv_text(parsed_text)
+        guess, retrieval = start_speculative_retrieval(cleaned_text)
+
+        # Analisis AI
+        pm = PromptManager()
+        pm.add_message("system", f"""
+            Kamu adalah asisten rekrutmen profesional.
+
+            Tugasmu adalah menentukan apakah **dokumen yang diberikan benar-benar merupakan CV (Curriculum Vitae)** atau **bukan**.
+
+            ### Definisi CV yang Sah:
+            CV wajib berisi sebagian besar dari elemen-elemen berikut ini:
+            - Informasi pribadi
+            - Ringkasan profil atau tujuan karier
+            - Riwayat pendidikan
+            - Pengalaman kerja
+            - Daftar keterampilan
+            - Sertifikasi/pelatihan (opsional)
+
+            Jika hanya berupa identitas seperti KTP, SIM, atau cover letter → bukan CV.
+
+            Dokumen:
+            {cleaned_text}
+        """)
+        pm.add_message("user", "Tolong kembalikan struktur data CV yang dianalisis.")
+        result = pm.generate_structure(AnalyzeCV)
+
+        is_cv = result["is_CV"]
+        category = result["category"] or "None"  # Jaga-jaga agar tidak None
+        skills = result["skills"]
+        experience = result['experience']
+        ensure_current(cv.user_id, token, "saving CV")
+
+        # Tangani dokumen bukan CV
+        if not is_cv:
+            send_notification(cv.user_id, {
+                "type": "error",
+                "title": "❌ Dokumen Tidak Valid",
+                "message": "Dokumen yang diunggah bukan CV atau tidak dapat dianalisis. Silakan unggah ulang dokumen Anda."
+            })
+            return False
+
+        # Jika CV valid
+        cv.parsed_text = cleaned_text
+        cv.category = category
+        cv.status = "completed"
+        with user_lock(cv.user_id, token, "saving CV"):
+            # kategori dari AnalyzeCV, sama dengan nama collection crawler
+            cv.save(skip_categorization=True, update_fields=["parsed_text", "category", "status"])
+
+        user = get_user_model().objects.get(id=cv.user_id)
+        documents = speculative_documents(guess, retrieval, category)
+        job_matching(user, cv.id, skills, experience, documents=documents, token=token)
+
+        print("CV processed successfully")
+        return True
+
+    except Superseded:
+        if retrieval is not None:
+            retrieval.cancel()
+        print(f"CV {cv_id} superseded by a newer upload, stopping")
+        return False
+
+    except Exception as e:
+        print(f"Error processing CV {cv_id}: {str(e)}")
+
+        if cv:
+            try:
+                # CV yang sudah diganti upload baru tidak ditandai gagal (dan tidak dibuat ulang)
+                ensure_current(cv.user_id, token, "marking CV failed")
+                if not cv.category or cv.category is None:
+                    cv.category = "None"  # <- pastikan kategori aman
+                if not cv.parsed_text:
+                    cv.parsed_text = ""  # <- biar aman juga
+                cv.status = "failed"
+                cv.save(update_fields=["category", "parsed_text", "status"])
+
+                send_notification(cv.user_id, {
+                    "type": "error",
+                    "title": "❌ Gagal Memproses",
+                    "message": "Gagal mengunggah atau memproses CV Anda. Silakan coba kembali."
+                })
+            except Superseded:
+                # error dari run yang sudah digantikan upload baru: bukan kegagalan task
+                print(f"CV {cv_id} superseded by a newer upload, error ignored")
+                return False
+            except Exception as save_error:
+                print(f"❗ Gagal menyimpan status gagal: {str(save_error)}")
+
+        raise e
+
+
+# file CV content-addressed yang tidak dipakai CV mana pun lagi (lihat cv/storage.py)
+@cv_queue.periodic_task(crontab(hour=19, minute=0), name="cleanup_cv_files")  # 02-00 dikurangi 7 jam
+def cleanup_cv_files():
+    removed = remove_unreferenced_files(CV.objects.values_list("file_url", flat=True))
+    print(f"🧹 Removed {removed} unreferenced CV files")
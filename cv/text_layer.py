@@ -0,0 +1,149 @@
+import os
+import re
+import time
+import logging
+import zipfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from lxml import etree
+from pypdf import PdfReader
+
+logger = logging.getLogger(__name__)
+
+# CV yang dibuat langsung dari Word/Docs/LaTeX sudah punya text layer, tidak perlu OCR remote.
+# Parsing PDF itu CPU-bound (pure Python), jadi dijalankan di process pool supaya tidak
+# menahan GIL thread worker huey yang lain. Module ini sengaja tidak import Django
+# karena di-import ulang oleh child process (spawn).
+TEXT_LAYER_WORKERS = int(os.getenv("CV_TEXT_LAYER_WORKERS", 2))
+TEXT_LAYER_TIMEOUT = float(os.getenv("CV_TEXT_LAYER_TIMEOUT", 20))
+MIN_CHARS_PER_PAGE = int(os.getenv("CV_TEXT_LAYER_MIN_CHARS_PER_PAGE", 200))
+MAX_GARBAGE_RATIO = float(os.getenv("CV_TEXT_LAYER_MAX_GARBAGE_RATIO", 0.05))
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# karakter selain huruf/angka, spasi dan tanda baca/simbol yang umum di CV dianggap sampah
+# (glyph font yang tidak ter-mapping, private use area, karakter kontrol, U+FFFD)
+GARBAGE_RE = re.compile(r'[^\w\s.,;:!?()\[\]{}<>@#$%&*+=/\\|\'"`~^\-–—•·●▪◦○■□►✓’‘“”…°©®™€£¥]')
+# font tanpa ToUnicode map diekstrak pypdf sebagai "(cid:123)"
+CID_RE = re.compile(r'\(cid:\d+\)')
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def read_pdf_text(file_path):
+    reader = PdfReader(file_path)
+    pages = [page.extract_text() or "" for page in reader.pages]
+    return "\n\n".join(pages), len(pages)
+
+
+def read_docx_text(file_path):
+    with zipfile.ZipFile(file_path) as docx:
+        root = etree.fromstring(docx.read("word/document.xml"))
+
+    lines = []
+    for paragraph in root.iter(f"{WORD_NS}p"):
+        parts = []
+        for node in paragraph.iter(f"{WORD_NS}t", f"{WORD_NS}tab", f"{WORD_NS}br"):
+            if node.tag == f"{WORD_NS}t":
+                parts.append(node.text or "")
+            else:
+                parts.append("\t" if node.tag == f"{WORD_NS}tab" else "\n")
+        text = "".join(parts)
+        if not text.strip():
+            continue
+        style = paragraph.find(f"{WORD_NS}pPr/{WORD_NS}pStyle")
+        style = style.get(f"{WORD_NS}val", "") if style is not None else ""
+        if style.lower().startswith("heading"):
+            text = "# " + text
+        elif paragraph.find(f"{WORD_NS}pPr/{WORD_NS}numPr") is not None:
+            text = "- " + text
+        lines.append(text)
+
+    # docx tidak punya halaman tetap, perkirakan ~3000 karakter per halaman untuk cek kepadatan
+    text = "\n".join(lines)
+    return text, max(1, len(text) // 3000)
+
+
+def read_text_layer(file_path):
+    """Dijalankan di child process: (text, jumlah halaman) dari text layer PDF/DOCX."""
+    if file_path.lower().endswith(".docx"):
+        return read_docx_text(file_path)
+    return read_pdf_text(file_path)
+
+
+def text_quality(text, pages):
+    stripped = re.sub(r'\s+', '', text)
+    garbage = len(GARBAGE_RE.findall(text)) + sum(len(cid) for cid in CID_RE.findall(text))
+    return {
+        "chars_per_page": len(stripped) / max(pages, 1),
+        "garbage_ratio": garbage / len(stripped) if stripped else 1.0,
+    }
+
+
+def is_usable_text(quality):
+    return quality["chars_per_page"] >= MIN_CHARS_PER_PAGE and quality["garbage_ratio"] <= MAX_GARBAGE_RATIO
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, bukan fork: worker huey memakai thread dan fork dari proses multi-thread tidak aman
+            _pool = ProcessPoolExecutor(
+                max_workers=TEXT_LAYER_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _reset_pool(pool, terminate=False):
+    """Buang pool yang rusak/macet; terminate=True mematikan child process yang masih jalan."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    # ProcessPoolExecutor (Python < 3.14) tidak punya API untuk mematikan worker,
+    # jadi child process diambil dari atribut internal _processes
+    processes = list((getattr(pool, "_processes", None) or {}).values()) if terminate else []
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
+def extract_text_layer(file_path):
+    """
+    Ambil teks CV dari text layer file secara lokal. Kembalikan None kalau file
+    hasil scan/gambar, gagal dibaca, atau kualitas teksnya jelek (perlu OCR remote).
+    """
+    start = time.perf_counter()
+    pool = _get_pool()
+    try:
+        text, pages = pool.submit(read_text_layer, file_path).result(timeout=TEXT_LAYER_TIMEOUT)
+    except BrokenProcessPool as e:
+        logger.warning(f"⚠️ Text layer pool broken ({e}), falling back to OCR")
+        _reset_pool(pool)
+        return None
+    except TimeoutError:
+        # child yang macet tetap memegang slot pool; matikan supaya upload berikutnya tidak ikut menunggu
+        logger.warning(
+            f"⚠️ Text layer {os.path.basename(file_path)} timed out after {TEXT_LAYER_TIMEOUT:.0f}s, "
+            f"restarting pool and falling back to OCR"
+        )
+        _reset_pool(pool, terminate=True)
+        return None
+    except Exception as e:
+        logger.info(f"↩️ No usable text layer in {os.path.basename(file_path)} ({e!r}), falling back to OCR")
+        return None
+
+    quality = text_quality(text, pages)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    usable = is_usable_text(quality)
+    logger.info(
+        f"📄 Text layer {os.path.basename(file_path)}: pages={pages} "
+        f"chars/page={quality['chars_per_page']:.0f} garbage={quality['garbage_ratio']:.1%} "
+        f"{elapsed_ms:.0f}ms -> {'local' if usable else 'OCR'}"
+    )
+    return text if usable else None
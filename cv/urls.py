@@ -1,6 +1,6 @@
-from django.urls import path
-from .views import CVUploadView
-
-urlpatterns = [
-    path('upload/', CVUploadView.as_view(), name='cv-upload'),
+from django.urls import path
+from .views import CVUploadView
+
+urlpatterns = [
+    path('upload/', CVUploadView.as_view(), name='cv-upload'),
 ] 
\ No newline at end of file
@@ -1,55 +1,100 @@
-import re
-
-def clean_cv_text(text):
-    if not text:
-        return text
-    
-    # remove LaTeX math
-    text = re.sub(r'\$\\cdot\$', ' • ', text)
-    text = re.sub(r'\$[^$]*\$', '', text)
-    
-    # remove backslash & escape characters
-    text = re.sub(r'\\\\', ' ', text)
-    text = re.sub(r'\\&', '&', text)
-    text = re.sub(r'\\n', '\n', text)
-    text = re.sub(r'\\(?![a-zA-Z])', '', text)
-    text = re.sub(r'\\(?=[a-zA-Z])', '', text)
-    
-    # remove HTML/markdown artifacts
-    text = re.sub(r'<br\s*/?>', '\n', text, flags=re.IGNORECASE)
-    text = re.sub(r'<[^>]+>', '', text)
-    
-    # fix URLs that got broken by cdot(.) replacement
-    text = re.sub(r'https: //', 'https://', text)
-    text = re.sub(r'http: //', 'http://', text)
-    
-    # spacing
-    text = re.sub(r'\s+', ' ', text)
-    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text) 
-    text = re.sub(r'^\s+|\s+$', '', text, flags=re.MULTILINE) 
-
-    # fix formatting issues
-    text = re.sub(r'\n- ([a-z])', lambda m: f'-{m.group(1)}', text)
-    
-    # fix bullet points
-    text = re.sub(r'\s*•\s*', '\n• ', text) 
-    text = re.sub(r'^\s*-\s+', '- ', text, flags=re.MULTILINE)  
-    text = re.sub(r'^\s*#\s*', '# ', text, flags=re.MULTILINE)
-    
-    # remove punctuation
-    text = re.sub(r'\.{3,}', '...', text)
-    text = re.sub(r'-{2,}', '--', text)
-    
-    # clean up email and link format
-    text = re.sub(r'\s+@\s+', '@', text)
-    text = re.sub(r'\s+\.\s+com', '.com', text)
-    
-    # remove extra whitespace & separators
-    text = re.sub(r'\s*:\s*', ': ', text)
-    text = re.sub(r'\s*,\s*', ', ', text)
-    text = re.sub(r'\s*;\s*', '; ', text)
-    
-    # final cleanup
-    text = text.strip()
-    
-    return text
\ No newline at end of file
+import re
+
+# pattern di-compile sekali di level module; langkah yang tidak saling mempengaruhi
+# digabung jadi satu alternation + callback, urutan langkah lain tetap sama.
+# lookahead (?=[...]) di depan pattern gabungan membuat engine regex bisa melompati
+# posisi yang tidak mungkin match (tanpa itu alternation jauh lebih lambat)
+LATEX_CDOT = '$\\cdot$'
+LATEX_MATH_RE = re.compile(r'\$[^$]*\$')
+
+# \\ -> spasi, \& -> &, \n -> newline, backslash lain dibuang
+ESCAPE_RE = re.compile(r'\\[\\&n]?')
+ESCAPES = {'\\\\': ' ', '\\&': '&', '\\n': '\n', '\\': ''}
+
+BR_RE = re.compile(r'<br\s*/?>', re.IGNORECASE)
+TAG_RE = re.compile(r'<[^>]+>')
+BROKEN_URL_RE = re.compile(r'(https?): //')
+
+WHITESPACE_RE = re.compile(r'\s+')
+BULLET_RE = re.compile(r'(?=[\s•])\s*•\s*')
+# setelah whitespace dirapikan hanya awal teks yang bisa diawali "-" atau "#"
+LINE_PREFIX_RE = re.compile(r'^\s*(?:(-)\s+|#\s*)')
+
+# titik/strip berulang, spasi di sekitar "@" dan " . com"
+INLINE_RE = re.compile(r'(?=[-.\s])(?:(\.{3,})|(-{2,})|(\s+@\s+)|\s+\.\s+com)')
+INLINE = ('...', '--', '@', '.com')
+
+# rangkaian ":", ",", ";" beserta spasi di sekitarnya
+SEPARATORS_RE = re.compile(r'(?=[\s:,;])\s*[:,;](?:\s*[:,;])*\s*')
+SEPARATOR_ORDER = {':': 0, ',': 1, ';': 2}
+
+
+def _replace_escape(match):
+    return ESCAPES[match.group()]
+
+
+def _replace_line_prefix(match):
+    return '- ' if match.group(1) else '# '
+
+
+def _replace_inline(match):
+    return INLINE[match.lastindex - 1] if match.lastindex else INLINE[3]
+
+
+def _replace_separators(match):
+    marks = match.group().strip()
+    if len(marks) == 1:
+        return marks + ' '
+    # hasil sama dengan merapikan ":" lalu "," lalu ";" bergantian: spasi di antara dua
+    # separator hanya tersisa kalau separator kedua dirapikan lebih dulu (atau sama)
+    marks = [char for char in marks if char in SEPARATOR_ORDER]
+    text = marks[0]
+    for prev, mark in zip(marks, marks[1:]):
+        if SEPARATOR_ORDER[prev] >= SEPARATOR_ORDER[mark]:
+            text += ' '
+        text += mark
+    return text + ' '
+
+
+def clean_cv_text(text):
+    if not text:
+        return text
+
+    # pass yang karakter pemicunya tidak ada di teks dilewati (cek "in" jauh lebih murah dari regex)
+
+    # remove LaTeX math
+    if '$' in text:
+        text = text.replace(LATEX_CDOT, ' • ')
+        text = LATEX_MATH_RE.sub('', text)
+
+    # remove backslash & escape characters
+    if '\\' in text:
+        text = ESCAPE_RE.sub(_replace_escape, text)
+
+    # remove HTML/markdown artifacts
+    if '<' in text:
+        text = BR_RE.sub('\n', text)
+        text = TAG_RE.sub('', text)
+
+    # fix URLs that got broken by cdot(.) replacement
+    if ': //' in text:
+        text = BROKEN_URL_RE.sub(r'\1://', text)
+
+    # spacing (setelah ini tidak ada newline lagi, jadi cukup strip spasi di ujung)
+    text = WHITESPACE_RE.sub(' ', text).strip(' ')
+
+    # fix bullet points
+    if '•' in text:
+        text = BULLET_RE.sub('\n• ', text)
+    text = LINE_PREFIX_RE.sub(_replace_line_prefix, text, count=1)
+
+    # punctuation, email and link format
+    text = INLINE_RE.sub(_replace_inline, text)
+
+    # remove extra whitespace & separators
+    text = SEPARATORS_RE.sub(_replace_separators, text)
+
+    # final cleanup
+    text = text.strip()
+
+    return text
@@ -1,59 +1,56 @@
-import os
-import uuid
-from django.conf import settings
-from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
-from rest_framework import status
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from .models import CV
-from .serializers import CVUploadSerializer
-from .tasks import process_cv
-
-
-class CVUploadView(APIView):
-    permission_classes = [IsAuthenticated]
-
-    def post(self, request):
-        try:
-            user_id = str(request.user.id)
-            existing_cv = CV.objects.filter(user_id=user_id).first()
-            
-            if existing_cv:
-                if existing_cv.file_url and os.path.exists(existing_cv.file_url):
-                    try:
-                        os.remove(existing_cv.file_url)
-                    except OSError:
-                        pass 
-                
-                existing_cv.delete()
-            
-            file = request.FILES.get('file')
-            if not file:
-                return Response({"error": "No file was uploaded"}, status=status.HTTP_400_BAD_REQUEST)
-            
-            if not file.name.lower().endswith(('.pdf', '.docx')):
-                return Response({"error": "Only PDF and DOCX files are allowed"}, status=status.HTTP_400_BAD_REQUEST)
-            
-            filename = f"{uuid.uuid4()}_{file.name}"
-            file_path = os.path.join('cv_files', filename)
-            
-            os.makedirs(os.path.join(settings.MEDIA_ROOT, 'cv_files'), exist_ok=True)
-            
-            saved_path = default_storage.save(file_path, ContentFile(file.read()))
-            
-            absolute_file_path = os.path.join(settings.MEDIA_ROOT, saved_path)
-            
-            cv_obj = CV.objects.create(
-                user_id=user_id,
-                file_url=absolute_file_path
-            )
-            
-            process_cv(cv_obj.id)
-            
-            serializer = CVUploadSerializer(cv_obj)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-            
-        except Exception as e:
-            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from .models import CV
+from .serializers import CVUploadSerializer
+from .storage import save_upload, UploadTooLarge, MAX_UPLOAD_BYTES
+from .pipeline import start_pipeline
+from .tasks import process_cv
+
+
+class CVUploadView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        try:
+            user_id = str(request.user.id)
+
+            # tolak request yang jelas terlalu besar sebelum body multipart dibaca
+            content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+            if content_length > MAX_UPLOAD_BYTES + 64 * 1024:  # + overhead header multipart
+                return Response({"error": "File is too large"}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+            file = request.FILES.get('file')
+            if not file:
+                return Response({"error": "No file was uploaded"}, status=status.HTTP_400_BAD_REQUEST)
+
+            if not file.name.lower().endswith(('.pdf', '.docx')):
+                return Response({"error": "Only PDF and DOCX files are allowed"}, status=status.HTTP_400_BAD_REQUEST)
+
+            try:
+                absolute_file_path, _ = save_upload(file)
+            except UploadTooLarge as e:
+                return Response({"error": str(e)}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+            # token baru: process_cv/job_matching dari upload sebelumnya berhenti di tahap berikutnya
+            token = start_pipeline(user_id)
+            existing_cv = CV.objects.filter(user_id=user_id).first()
+
+            if existing_cv:
+                # file lama tidak dihapus di sini (bisa dipakai ulang upload lain dengan isi sama),
+                # file yang tidak lagi dipakai dibersihkan task cleanup_cv_files
+                existing_cv.delete()
+
+            cv_obj = CV.objects.create(
+                user_id=user_id,
+                file_url=absolute_file_path
+            )
+
+            process_cv(cv_obj.id, token)
+
+            serializer = CVUploadSerializer(cv_obj)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
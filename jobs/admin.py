@@ -1,8 +1,13 @@
-from django.contrib import admin
-from .models import Job
-
-@admin.register(Job)
-class JobAdmin(admin.ModelAdmin):
-    list_display = ("id",'job_title', "company_name", "category", 'created_at')  # tampilkan kolom di list view
-    list_filter =  ('job_title', "category") # tambahkan filter di sisi kanan admin
-    search_fields = ("id", 'job_title', 'company_name')
\ No newline at end of file
+from django.contrib import admin
+from .models import Job, CrawlRun
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id",'job_title', "company_name", "category", 'created_at')  # tampilkan kolom di list view
+    list_filter =  ('job_title', "category") # tambahkan filter di sisi kanan admin
+    search_fields = ("id", 'job_title', 'company_name')
+
+@admin.register(CrawlRun)
+class CrawlRunAdmin(admin.ModelAdmin):
+    list_display = ("id", "status", "started_at", "finished_at")
+    list_filter = ("status",)
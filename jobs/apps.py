@@ -1,9 +1,9 @@
-from django.apps import AppConfig
-
-
-class JobsConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'jobs'
-
-    def ready(self):
+from django.apps import AppConfig
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'jobs'
+
+    def ready(self):
         import jobs.task
\ No newline at end of file
@@ -0,0 +1,157 @@
+import os
+import time
+import asyncio
+import logging
+import uuid
+import httpx
+import psutil
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+
+logger = logging.getLogger(__name__)
+
+# profile fetch: "http" (tanpa browser, fallback ke "text"), "text" (browser tanpa gambar/font/media/JS), "full"
+FETCH_PROFILE = os.getenv("CRAWL_FETCH_PROFILE", "http")
+FETCH_CONCURRENCY = int(os.getenv("CRAWL_FETCH_CONCURRENCY", 3))
+HTTP_TIMEOUT = float(os.getenv("CRAWL_HTTP_TIMEOUT", 20))
+
+BROWSER_PROFILES = {
+    "full": BrowserConfig(headless=True),
+    "text": BrowserConfig(headless=True, text_mode=True, light_mode=True),
+}
+
+# halaman guest LinkedIn ini sudah server-rendered, tidak butuh JS
+STATIC_URL_PATTERNS = ("linkedin.com/jobs/view/", "linkedin.com/jobs/search")
+
+HTTP_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/126.0 Safari/537.36"
+    ),
+    "Accept-Language": "en-US,en;q=0.9,id;q=0.8",
+}
+
+
+class FetchedPage:
+    """Hasil fetch HTTP biasa, atributnya sama dengan yang dipakai crawler dari CrawlResult."""
+
+    def __init__(self, url, html, markdown):
+        self.url = url
+        self.html = html
+        self.markdown = markdown
+        self.success = True
+
+
+def _rss_mb():
+    # memori proses ini + child process (browser chromium)
+    process = psutil.Process()
+    total = process.memory_info().rss
+    for child in process.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / (1024 * 1024)
+
+
+class FetchStats:
+    def __init__(self):
+        self.counts = {}
+
+    def record(self, profile, seconds, rss_mb):
+        stats = self.counts.setdefault(profile, {"pages": 0, "seconds": 0.0, "peak_rss_mb": 0.0})
+        stats["pages"] += 1
+        stats["seconds"] += seconds
+        stats["peak_rss_mb"] = max(stats["peak_rss_mb"], rss_mb)
+
+    def report(self):
+        for profile, stats in self.counts.items():
+            avg_ms = stats["seconds"] / stats["pages"] * 1000 if stats["pages"] else 0
+            logger.info(
+                f"📊 fetch[{profile}]: pages={stats['pages']} avg={avg_ms:.0f}ms "
+                f"peak_rss={stats['peak_rss_mb']:.0f}MB"
+            )
+
+
+class CrawlFetcher:
+    """
+    Pengganti AsyncWebCrawler untuk crawler lowongan (interface arun(url) yang sama):
+    - halaman statis di-fetch lewat HTTP biasa, fallback ke browser kalau gagal/kosong
+    - browser memakai profile text-only dan pool session (context + page) sebesar FETCH_CONCURRENCY
+    - waktu fetch dan memori per profile dicatat di self.stats
+    """
+
+    def __init__(self, profile=FETCH_PROFILE, pool_size=FETCH_CONCURRENCY):
+        self.profile = profile
+        self.browser_profile = "full" if profile == "full" else "text"
+        self.pool_size = pool_size
+        self.stats = FetchStats()
+        self.crawler = None
+        self.http = None
+        self.sessions = asyncio.Queue()
+        self._browser_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        if self.profile == "http":
+            self.http = httpx.AsyncClient(headers=HTTP_HEADERS, timeout=HTTP_TIMEOUT, follow_redirects=True)
+        else:
+            await self._ensure_browser()
+        return self
+
+    async def __aexit__(self, *exc):
+        if self.http:
+            await self.http.aclose()
+        if self.crawler:
+            while not self.sessions.empty():
+                session_id = self.sessions.get_nowait()
+                try:
+                    await self.crawler.crawler_strategy.kill_session(session_id)
+                except Exception:
+                    pass
+            await self.crawler.close()
+        self.stats.report()
+
+    async def _ensure_browser(self):
+        # browser baru dijalankan saat pertama kali dibutuhkan (profile http jarang butuh)
+        async with self._browser_lock:
+            if self.crawler is None:
+                crawler = AsyncWebCrawler(config=BROWSER_PROFILES[self.browser_profile])
+                await crawler.start()
+                for _ in range(self.pool_size):
+                    self.sessions.put_nowait(f"crawl-{uuid.uuid4()}")
+                self.crawler = crawler
+
+    async def arun(self, url, *args, **kwargs):
+        if self.http and any(pattern in url for pattern in STATIC_URL_PATTERNS):
+            start = time.perf_counter()
+            try:
+                page = await self._fetch_http(url)
+                self.stats.record("http", time.perf_counter() - start, _rss_mb())
+                return page
+            except Exception as e:
+                logger.info(f"  ↩️ HTTP fetch failed for {url} ({e}), falling back to browser")
+
+        start = time.perf_counter()
+        result = await self._fetch_browser(url)
+        self.stats.record(self.browser_profile, time.perf_counter() - start, _rss_mb())
+        return result
+
+    async def _fetch_http(self, url):
+        response = await self.http.get(url)
+        response.raise_for_status()
+        html = response.text
+        # LinkedIn mengarahkan ke authwall kalau menolak request guest
+        if "authwall" in str(response.url) or not html.strip():
+            raise ValueError("authwall or empty response")
+        markdown = DefaultMarkdownGenerator().generate_markdown(html, base_url=url, citations=False)
+        return FetchedPage(url, html, markdown.raw_markdown)
+
+    async def _fetch_browser(self, url):
+        await self._ensure_browser()
+        # pinjam satu session dari pool, context & page-nya dipakai ulang antar fetch
+        session_id = await self.sessions.get()
+        try:
+            config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS, session_id=session_id)
+            return await self.crawler.arun(url, config=config)
+        finally:
+            self.sessions.put_nowait(session_id)
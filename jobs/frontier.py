@@ -0,0 +1,177 @@
+import os
+import logging
+from datetime import datetime, timedelta
+from django.db import transaction
+from core.ai.crawl import Jobs
+from jobs.models import CrawlRun, CrawlItem
+from jobs.utils import normalize_job_url
+
+logger = logging.getLogger(__name__)
+
+CRAWL_RESUME_HOURS = int(os.getenv("CRAWL_RESUME_HOURS", 12))  # run yang lebih tua dari ini tidak di-resume
+# shard yang belum selesai dan tidak disentuh selama ini dianggap hilang (worker restart,
+# task huey terbuang) dan diantrikan ulang oleh resume_crawl
+CRAWL_SHARD_STALE_MINUTES = int(os.getenv("CRAWL_SHARD_STALE_MINUTES", 90))
+
+
+class CrawlFrontier:
+    """
+    Checkpoint crawling di Postgres, supaya run yang crash/restart bisa lanjut
+    dari keyword dan url terakhir tanpa mengulang fetch dan panggilan LLM.
+    Tiap (kategori, keyword) adalah satu shard yang dikerjakan task huey terpisah.
+    Semua method sync, panggil lewat sync_to_async dari kode async.
+    """
+
+    def __init__(self, run):
+        self.run = run
+
+    @classmethod
+    def resume(cls):
+        """Run yang masih berjalan (dalam CRAWL_RESUME_HOURS), None kalau tidak ada."""
+        since = datetime.now() - timedelta(hours=CRAWL_RESUME_HOURS)
+        CrawlRun.objects.filter(status='running', started_at__lt=since).update(
+            status='abandoned', finished_at=datetime.now()
+        )
+
+        run = CrawlRun.objects.filter(status='running').order_by('-started_at').first()
+        if run:
+            logger.info(f"♻️ Resuming crawl run {run.id} (started {run.started_at})")
+            return cls(run)
+        return None
+
+    @classmethod
+    def resume_or_start(cls):
+        frontier = cls.resume()
+        if frontier is None:
+            frontier = cls(CrawlRun.objects.create())
+            logger.info(f"🆕 Starting crawl run {frontier.run.id}")
+        return frontier
+
+    @classmethod
+    def for_run(cls, run_id):
+        return cls(CrawlRun.objects.get(id=run_id))
+
+    @staticmethod
+    def keyword_key(category, keyword):
+        return f"{category.strip()}:{keyword}"
+
+    def plan_shards(self, category_keywords, stale_minutes=None):
+        """
+        Daftarkan semua shard run ini, return shard yang belum selesai. Dengan stale_minutes,
+        hanya shard yang tidak disentuh selama itu (task-nya hilang) yang dikembalikan.
+        Shard yang dikembalikan ditandai baru diantrikan (updated_at).
+        """
+        cutoff = datetime.now() - timedelta(minutes=stale_minutes) if stale_minutes else None
+        pending = []
+        for category, keywords in category_keywords.items():
+            for keyword in keywords:
+                item, created = CrawlItem.objects.get_or_create(
+                    run=self.run, kind='keyword', key=self.keyword_key(category, keyword),
+                    defaults={"category": category, "keyword": keyword},
+                )
+                if item.status in ('done', 'failed'):
+                    continue
+                if cutoff and not created and item.updated_at >= cutoff:
+                    continue  # masih antri / sedang dikerjakan
+                pending.append(item)
+
+        CrawlItem.objects.filter(id__in=[item.id for item in pending]).update(updated_at=datetime.now())
+        return [(item.category, item.keyword) for item in pending]
+
+    def touch_shard(self, category, keyword):
+        # heartbeat: shard mulai dikerjakan, jangan diantrikan ulang resume_crawl
+        CrawlItem.objects.filter(
+            run=self.run, kind='keyword', key=self.keyword_key(category, keyword)
+        ).update(updated_at=datetime.now())
+
+    def done_keywords(self, category):
+        # keyword yang listing-nya sudah selesai tidak perlu di-fetch ulang
+        keys = CrawlItem.objects.filter(
+            run=self.run, kind='keyword', category=category, status__in=['extracted', 'done']
+        ).values_list('key', flat=True)
+        return set(keys)
+
+    def pending_jobs(self, category, keywords):
+        items = CrawlItem.objects.filter(
+            run=self.run, kind='job', category=category, keyword__in=keywords, status='queued'
+        )
+        return [Jobs(**item.payload) for item in items if item.payload]
+
+    def queued_jobs_count(self, category, keyword):
+        # lowongan yang fetch/ekstraksi/save-nya gagal tetap 'queued'
+        return CrawlItem.objects.filter(
+            run=self.run, kind='job', category=category, keyword=keyword, status='queued'
+        ).count()
+
+    def fail_queued_jobs(self, category, keyword):
+        """Retry shard habis: lowongan yang masih 'queued' ditandai failed, return jumlahnya."""
+        return CrawlItem.objects.filter(
+            run=self.run, kind='job', category=category, keyword=keyword, status='queued'
+        ).update(status='failed', updated_at=datetime.now())
+
+    def mark_keyword_listed(self, category, keyword, jobs):
+        # antrikan url lowongan dan tandai listing keyword selesai dalam satu transaksi
+        with transaction.atomic():
+            for job in jobs:
+                CrawlItem.objects.get_or_create(
+                    run=self.run, kind='job', key=normalize_job_url(job.url),
+                    defaults={"category": category, "keyword": keyword, "payload": job.model_dump()},
+                )
+            CrawlItem.objects.update_or_create(
+                run=self.run, kind='keyword', key=self.keyword_key(category, keyword),
+                defaults={"category": category, "keyword": keyword, "status": "extracted"},
+            )
+
+    def mark_extracted(self, url):
+        CrawlItem.objects.filter(run=self.run, kind='job', key=normalize_job_url(url)).update(
+            status='extracted', updated_at=datetime.now()
+        )
+
+    def mark_extracted_many(self, urls):
+        keys = [normalize_job_url(url) for url in urls]
+        CrawlItem.objects.filter(run=self.run, kind='job', key__in=keys).update(
+            status='extracted', updated_at=datetime.now()
+        )
+
+    def is_keyword_listed(self, category, keyword):
+        return self.keyword_key(category, keyword) in self.done_keywords(category)
+
+    def complete_shard(self, category, keyword, summary, status='done'):
+        """
+        Simpan ringkasan shard (status done, atau failed kalau listing-nya tetap gagal).
+        Shard terakhir yang selesai menutup run dan mengembalikan agregat semua shard;
+        shard lain mengembalikan None.
+        """
+        with transaction.atomic():
+            CrawlItem.objects.filter(
+                run=self.run, kind='keyword', key=self.keyword_key(category, keyword)
+            ).update(status=status, payload=summary, updated_at=datetime.now())
+            return self.finish_run()
+
+    def finish_run(self):
+        """Tutup run kalau semua shard selesai (done/failed), return agregatnya (None kalau belum/sudah ditutup)."""
+        with transaction.atomic():
+            # lock row run supaya hanya satu shard yang melakukan agregasi
+            run = CrawlRun.objects.select_for_update().get(id=self.run.id)
+            shards = CrawlItem.objects.filter(run=run, kind='keyword')
+            if run.status != 'running' or shards.exclude(status__in=['done', 'failed']).exists():
+                return None
+
+            aggregate = {"shards": 0, "failed_shards": 0, "jobs": 0, "failed_jobs": 0, "categories": {}, "stats": []}
+            for shard in shards:
+                shard_summary = shard.payload or {}
+                aggregate["shards"] += 1
+                aggregate["failed_shards"] += 1 if shard.status == 'failed' else 0
+                aggregate["jobs"] += shard_summary.get("jobs", 0)
+                aggregate["failed_jobs"] += shard_summary.get("failed", 0)
+                aggregate["categories"][shard.category] = (
+                    aggregate["categories"].get(shard.category, 0) + shard_summary.get("jobs", 0)
+                )
+                aggregate["stats"].append(shard_summary.get("stats", {}))
+
+            run.status = 'completed'
+            run.finished_at = datetime.now()
+            run.save(update_fields=['status', 'finished_at'])
+            self.run = run
+            logger.info(f"🏁 Crawl run {run.id} completed")
+            return aggregate
@@ -0,0 +1,82 @@
+import asyncio
+import time
+from urllib.parse import urlsplit, parse_qs
+from django.core.management.base import BaseCommand
+from core.ai.crawl import Jobs
+from jobs.archive import PageArchive, ReplayCrawler, ReplayLLM, ReplayFrontier, MemoryJobStore
+from jobs.task import CrawlContext, crawl_jobs_by_keywords, MAX_JOBS_PER_KEYWORD
+from jobs.utils import KnownJobIndex
+
+# field yang dibandingkan dengan hasil ekstraksi saat direkam
+COMPARED_FIELDS = [name for name in Jobs.model_fields if name != "job_id"]
+
+
+def normalize_value(value):
+    if isinstance(value, list):
+        return sorted(str(v).strip().lower() for v in value)
+    return " ".join(str(value).split()).lower()
+
+
+class Command(BaseCommand):
+    help = "Replay arsip halaman crawler (CRAWL_RECORD_DIR) secara offline untuk mengukur throughput dan akurasi ekstraksi."
+
+    def add_arguments(self, parser):
+        parser.add_argument("archives", nargs="+", help="File arsip .jsonl.gz")
+        parser.add_argument("--max-jobs", type=int, default=MAX_JOBS_PER_KEYWORD)
+
+    def handle(self, *args, **options):
+        pages, extractions = PageArchive.read(options["archives"])
+
+        keywords = []
+        for url in pages:
+            query = parse_qs(urlsplit(url).query)
+            if "/jobs/search" in url and query.get("keywords"):
+                keywords.append(query["keywords"][0])
+        keywords = list(dict.fromkeys(keywords))
+
+        crawler = ReplayCrawler(pages)
+        llm = ReplayLLM(extractions)
+        store = MemoryJobStore()
+
+        async def replay():
+            ctx = CrawlContext(
+                crawler, KnownJobIndex(), ReplayFrontier(), llm=llm, store=store,
+                page_delay=0, keyword_delay=0,
+            )
+            await crawl_jobs_by_keywords(ctx, "replay", keywords, options["max_jobs"])
+            return ctx
+
+        start = time.perf_counter()
+        ctx = asyncio.run(replay())
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(f"Pages in archive : {len(pages)} ({len(keywords)} keywords)")
+        self.stdout.write(f"Pages replayed   : {crawler.fetched} in {elapsed:.2f}s "
+                          f"({crawler.fetched / elapsed if elapsed else 0:.1f} pages/s)")
+        self.stdout.write(f"Jobs extracted   : {len(store.jobs)}, stand-in LLM calls: {llm.calls}")
+        for page_type, counts in ctx.stats.counts.items():
+            self.stdout.write(
+                f"{page_type:<17}: local={counts['local']} llm={counts['llm']} "
+                f"hit_rate={ctx.stats.hit_rate(page_type):.0%}"
+            )
+
+        # akurasi: bandingkan hasil replay dengan hasil ekstraksi yang direkam per field
+        matches = {field: 0 for field in COMPARED_FIELDS}
+        compared = 0
+        for job_json in store.jobs.values():
+            expected = extractions.get((job_json["source_url"], "detail"))
+            if not expected:
+                continue
+            expected = Jobs(**expected).model_dump()  # isi default untuk field yang tidak direkam
+            compared += 1
+            for field in COMPARED_FIELDS:
+                if normalize_value(job_json.get(field, "")) == normalize_value(expected.get(field, "")):
+                    matches[field] += 1
+
+        if not compared:
+            self.stdout.write("No recorded detail extractions to compare against.")
+            return
+
+        self.stdout.write(f"Accuracy vs recorded extraction ({compared} jobs):")
+        for field, count in matches.items():
+            self.stdout.write(f"  {field:<20} {count / compared:.0%}")
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_alter_job_company_employee_size_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='source_url',
+            field=models.URLField(blank=True, db_index=True, max_length=500, null=True),
+        ),
+    ]
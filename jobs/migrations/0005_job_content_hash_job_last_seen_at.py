@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_job_source_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='last_seen_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_job_content_hash_job_last_seen_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed'), ('abandoned', 'Abandoned')], default='running', max_length=20)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CrawlItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('keyword', 'Keyword'), ('job', 'Job')], max_length=20)),
+                ('category', models.CharField(max_length=50)),
+                ('key', models.CharField(max_length=500)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('extracted', 'Extracted'), ('done', 'Done')], default='queued', max_length=20)),
+                ('payload', models.JSONField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='jobs.crawlrun')),
+            ],
+            options={
+                'unique_together': {('run', 'kind', 'key')},
+            },
+        ),
+    ]
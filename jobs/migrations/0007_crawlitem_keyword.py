@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_crawlrun_crawlitem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crawlitem',
+            name='keyword',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 19:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_crawlitem_keyword'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='crawlitem',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('extracted', 'Extracted'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=20),
+        ),
+    ]
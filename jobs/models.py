@@ -1,29 +1,81 @@
-from django.db import models
-import uuid
-
-class Job(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    category = models.CharField(max_length=30, blank=True, null=True)
-    job_title = models.CharField(max_length=255)
-    company_industry = models.CharField(max_length=255, blank=True, null=True)
-    company_desc = models.TextField(blank=True, null=True)
-    company_name = models.CharField(max_length=255, blank=True, null=True)
-    company_employee_size = models.TextField(blank=True, null=True)
-    location = models.CharField(max_length=255, blank=True, null=True)
-    company_logo = models.URLField(max_length=500, blank=True, null=True)
-    url = models.URLField(max_length=500, unique=True)
-    job_type = models.TextField(blank=True, null=True)
-    industry = models.CharField(max_length=255, blank=True, null=True)
-    job_description = models.TextField(blank=True, null=True)
-    experience_level = models.TextField(blank=True, null=True)
-    education_level = models.TextField(blank=True, null=True)
-    salary = models.TextField(blank=True, null=True)
-    skills_required = models.TextField(blank=True, null=True)
-    date_posted = models.TextField(blank=True, null=True)
-    uploaded_to_vector_db = models.BooleanField(default=False)
-
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-
-    def __str__(self):
-        return f"{self.job_title} at {self.company_name}"
\ No newline at end of file
+from django.db import models
+import uuid
+
+class Job(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    category = models.CharField(max_length=30, blank=True, null=True)
+    job_title = models.CharField(max_length=255)
+    company_industry = models.CharField(max_length=255, blank=True, null=True)
+    company_desc = models.TextField(blank=True, null=True)
+    company_name = models.CharField(max_length=255, blank=True, null=True)
+    company_employee_size = models.TextField(blank=True, null=True)
+    location = models.CharField(max_length=255, blank=True, null=True)
+    company_logo = models.URLField(max_length=500, blank=True, null=True)
+    url = models.URLField(max_length=500, unique=True)
+    source_url = models.URLField(max_length=500, blank=True, null=True, db_index=True)  # url listing asal (LinkedIn)
+    job_type = models.TextField(blank=True, null=True)
+    industry = models.CharField(max_length=255, blank=True, null=True)
+    job_description = models.TextField(blank=True, null=True)
+    experience_level = models.TextField(blank=True, null=True)
+    education_level = models.TextField(blank=True, null=True)
+    salary = models.TextField(blank=True, null=True)
+    skills_required = models.TextField(blank=True, null=True)
+    date_posted = models.TextField(blank=True, null=True)
+    uploaded_to_vector_db = models.BooleanField(default=False)
+    content_hash = models.CharField(max_length=32, blank=True, null=True, db_index=True)  # md5 markdown halaman detail
+    last_seen_at = models.DateTimeField(blank=True, null=True)  # terakhir kali terlihat saat crawling
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.job_title} at {self.company_name}"
+
+class CrawlRun(models.Model):
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('abandoned', 'Abandoned'),
+    ]
+
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    status = models.CharField(choices=STATUS_CHOICES, default='running', max_length=20)
+
+    def __str__(self):
+        return f"CrawlRun {self.id} ({self.status})"
+
+
+class CrawlItem(models.Model):
+    """
+    Frontier crawling per run.
+    - keyword (shard): queued -> extracted (listing selesai, url diantrikan) -> done (semua lowongan diproses),
+      atau failed kalau listing tetap gagal setelah retry habis
+    - job (url lowongan): queued -> extracted, atau failed kalau tetap gagal setelah retry shard habis
+    """
+    KIND_CHOICES = [
+        ('keyword', 'Keyword'),
+        ('job', 'Job'),
+    ]
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('extracted', 'Extracted'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    run = models.ForeignKey(CrawlRun, on_delete=models.CASCADE, related_name='items')
+    kind = models.CharField(choices=KIND_CHOICES, max_length=20)
+    category = models.CharField(max_length=50)
+    keyword = models.CharField(max_length=255, blank=True, default='')  # shard (keyword) asal item
+    key = models.CharField(max_length=500)
+    status = models.CharField(choices=STATUS_CHOICES, default='queued', max_length=20)
+    payload = models.JSONField(blank=True, null=True)  # job: data listing (schema Jobs), keyword: ringkasan shard
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('run', 'kind', 'key')
+
+    def __str__(self):
+        return f"{self.kind} {self.key} ({self.status})"
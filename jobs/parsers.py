@@ -0,0 +1,166 @@
+import re
+import logging
+from bs4 import BeautifulSoup
+from core.ai.crawl import Jobs
+from jobs.utils import extract_linkedin_job_id
+
+logger = logging.getLogger(__name__)
+
+NOT_SPECIFIED = "Not specified"
+
+# field yang wajib terisi, kalau kosong baru fallback ke LLM
+REQUIRED_LISTING_FIELDS = ("job_title", "company_name", "url")
+REQUIRED_DETAIL_FIELDS = ("job_title", "company_name", "job_description")
+# field yang dipakai matching tapi jarang ada di HTML; kalau kosong setelah parse lokal,
+# diisi LLM dari deskripsi saja (lihat fill_missing_fields di jobs/task.py)
+MATCHING_DETAIL_FIELDS = ("skills_required", "education_level", "company_size")
+
+# label "job criteria" di halaman detail LinkedIn -> field di schema Jobs
+CRITERIA_FIELDS = {
+    "seniority level": "experience_level",
+    "employment type": "job_type",
+    "industries": "industry",
+}
+
+APPLY_URL_RE = re.compile(r'"(https?://[^"]+)"')
+
+# jenjang pendidikan di deskripsi; yang disebut paling awal dipakai (biasanya syarat minimal,
+# "S2 lebih disukai" datang belakangan)
+EDUCATION_PATTERNS = [
+    ("S3 / Doctorate", re.compile(r'\b(?:s3|phd|ph\.d|doctoral degree)\b', re.IGNORECASE)),
+    ("S2 / Master's degree", re.compile(r"\b(?:s2|master'?s degree|magister)\b", re.IGNORECASE)),
+    ("S1 / Bachelor's degree", re.compile(r"\b(?:s1|sarjana|bachelor'?s?(?: degree)?)\b", re.IGNORECASE)),
+    ("D3 / Diploma", re.compile(r'\b(?:d3|d4|diploma)\b', re.IGNORECASE)),
+    ("SMA / SMK", re.compile(r'\b(?:sma|smk|high school)\b', re.IGNORECASE)),
+]
+
+
+def _text(node):
+    if node is None:
+        return NOT_SPECIFIED
+    text = re.sub(r'\s+', ' ', node.get_text(" ", strip=True)).strip()
+    return text or NOT_SPECIFIED
+
+
+def _logo(node):
+    img = node.select_one("img.artdeco-entity-image") if node else None
+    if img is None:
+        return NOT_SPECIFIED
+    return img.get("data-delayed-url") or img.get("src") or NOT_SPECIFIED
+
+
+def is_complete(job: Jobs, required_fields) -> bool:
+    for field in required_fields:
+        value = getattr(job, field, None)
+        if not value or value == NOT_SPECIFIED:
+            return False
+    return True
+
+
+def parse_education_level(text: str) -> str:
+    found = []
+    for label, pattern in EDUCATION_PATTERNS:
+        match = pattern.search(text or "")
+        if match:
+            found.append((match.start(), label))
+    return min(found)[1] if found else NOT_SPECIFIED
+
+
+def parse_listing_html(html: str) -> list[Jobs]:
+    """
+    Parse halaman hasil pencarian LinkedIn (guest) jadi list Jobs tanpa LLM.
+    Hanya lowongan yang field wajibnya lengkap yang dikembalikan.
+    """
+    if not html:
+        return []
+
+    soup = BeautifulSoup(html, "lxml")
+    jobs = []
+    for card in soup.select("div.base-card, div.job-search-card"):
+        link = card.select_one("a.base-card__full-link") or card.select_one("a[href*='/jobs/view/']")
+        url = link.get("href", "").strip() if link else ""
+        urn = card.get("data-entity-urn", "")
+        date_node = card.select_one("time")
+
+        job = Jobs(
+            job_id=urn.rsplit(":", 1)[-1] if urn else (extract_linkedin_job_id(url) or NOT_SPECIFIED),
+            job_title=_text(card.select_one(".base-search-card__title")),
+            company_name=_text(card.select_one(".base-search-card__subtitle")),
+            company_logo=_logo(card),
+            location=_text(card.select_one(".job-search-card__location")),
+            salary=_text(card.select_one(".job-search-card__salary-info")),
+            date_posted=(date_node.get("datetime") if date_node else None) or _text(date_node),
+            url=url or NOT_SPECIFIED,
+        )
+        if is_complete(job, REQUIRED_LISTING_FIELDS):
+            jobs.append(job)
+    return jobs
+
+
+def parse_detail_html(html: str, url: str) -> Jobs:
+    """Parse halaman detail lowongan LinkedIn (guest) ke schema Jobs tanpa LLM."""
+    soup = BeautifulSoup(html or "", "lxml")
+
+    criteria = {}
+    for item in soup.select("li.description__job-criteria-item"):
+        label = _text(item.select_one(".description__job-criteria-subheader")).lower()
+        field = CRITERIA_FIELDS.get(label)
+        if field:
+            criteria[field] = _text(item.select_one(".description__job-criteria-text"))
+
+    # link apply eksternal disimpan LinkedIn di dalam komentar <code id="applyUrl">
+    apply_url = url
+    apply_node = soup.select_one("code#applyUrl")
+    if apply_node is not None:
+        match = APPLY_URL_RE.search(apply_node.decode_contents())
+        if match:
+            apply_url = match.group(1)
+
+    description = soup.select_one("div.show-more-less-html__markup") or soup.select_one("div.description__text")
+    top_card = soup.select_one("section.top-card-layout") or soup
+
+    return Jobs(
+        job_id=extract_linkedin_job_id(url) or NOT_SPECIFIED,
+        job_title=_text(soup.select_one("h1.top-card-layout__title, h1.topcard__title")),
+        job_description=description.get_text("\n", strip=True) if description else NOT_SPECIFIED,
+        company_name=_text(soup.select_one("a.topcard__org-name-link, span.topcard__flavor")),
+        company_logo=_logo(top_card),
+        location=_text(soup.select_one("span.topcard__flavor--bullet")),
+        salary=_text(soup.select_one("div.compensation__salary")),
+        date_posted=_text(soup.select_one("span.posted-time-ago__text")),
+        education_level=parse_education_level(description.get_text(" ", strip=True) if description else ""),
+        url=apply_url,
+        **criteria,
+    )
+
+
+class ExtractionStats:
+    """Hitung berapa halaman yang selesai di parser lokal vs yang fallback ke LLM."""
+
+    def __init__(self):
+        self.counts = {
+            "listing": {"local": 0, "llm": 0},
+            "detail": {"local": 0, "llm": 0},
+            "detail_fields": {"local": 0, "llm": 0},  # field matching yang diisi LLM setelah parse lokal
+        }
+
+    def record(self, page_type, source):
+        self.counts[page_type][source] += 1
+
+    def merge(self, counts):
+        # gabungkan hitungan dari shard lain (dict hasil self.counts)
+        for page_type, sources in counts.items():
+            for source, value in sources.items():
+                self.counts[page_type][source] += value
+
+    def hit_rate(self, page_type):
+        counts = self.counts[page_type]
+        total = counts["local"] + counts["llm"]
+        return counts["local"] / total if total else 0.0
+
+    def report(self):
+        for page_type, counts in self.counts.items():
+            logger.info(
+                f"📊 {page_type}: local={counts['local']} llm_fallback={counts['llm']} "
+                f"hit_rate={self.hit_rate(page_type):.0%}"
+            )
@@ -0,0 +1,70 @@
+import os
+import re
+import logging
+from core.ai.tokens import count_tokens, truncate_tokens
+
+logger = logging.getLogger(__name__)
+
+MAX_PROMPT_TOKENS = int(os.getenv("CRAWL_LLM_MAX_TOKENS", 6000))  # batas token markdown yang dikirim ke LLM
+
+# heading/landmark yang menandai akhir bagian lowongan (rekomendasi, footer, dll)
+STOP_MARKERS = re.compile(
+    r'^\s*(?:#+\s*)?(?:similar jobs|people also viewed|similar searches|explore (?:top content|collaborative articles)'
+    r'|get notified about new|looking for a job|more searches|explore more jobs|linkedin\s*©|©\s*\d{4})',
+    re.IGNORECASE,
+)
+
+# baris navigasi, tombol dan footer yang isinya hanya label (boleh berupa link markdown)
+NOISE_LINES = re.compile(
+    r'^\s*(?:[*-]\s*)?\[?\s*(?:skip to main content|sign in|join now|join or sign in|agree & join|'
+    r'new to linkedin\??|user agreement|privacy policy|cookie policy|copyright policy|accessibility|'
+    r'brand policy|guest controls|community guidelines|language|clear text|dismiss|report this job|'
+    r'save|apply|easy apply|show more|show less|close menu|expand search|jobs|people|learning|'
+    r'email or phone|password|forgot password\?|or)\s*\]?(?:\([^)]*\))?\s*$',
+    re.IGNORECASE,
+)
+
+# banner sign-in/persetujuan yang berupa kalimat
+NOISE_PREFIXES = re.compile(
+    r'^\s*(?:by clicking (?:continue|agree)|sign in to (?:view|create|see)|already on linkedin\?|'
+    r'you.re signed out|sign in to set job alerts)',
+    re.IGNORECASE,
+)
+
+IMAGE_RE = re.compile(r'!\[[^\]]*\]\([^)]*\)')
+JOB_LINK_QUERY_RE = re.compile(r'(linkedin\.com/jobs/view/[^\s)?]+)\?[^\s)]*')
+
+
+def prune_markdown(markdown: str, page_type: str, url: str = "", max_tokens: int = MAX_PROMPT_TOKENS) -> str:
+    """
+    Potong markdown halaman LinkedIn ke bagian yang relevan sebelum dikirim ke LLM:
+    mulai dari heading pertama, berhenti di "similar jobs"/footer, buang navigasi,
+    banner sign-in dan gambar, lalu batasi dengan hard cap token.
+    """
+    if not markdown:
+        return markdown
+
+    lines = markdown.splitlines()
+
+    # bagian sebelum heading pertama isinya navigasi & banner
+    start = next((i for i, line in enumerate(lines) if line.lstrip().startswith("#")), 0)
+
+    kept = []
+    for line in lines[start:]:
+        if kept and STOP_MARKERS.match(line):
+            break
+        if NOISE_LINES.match(line) or NOISE_PREFIXES.match(line):
+            continue
+        line = IMAGE_RE.sub('', line)
+        line = JOB_LINK_QUERY_RE.sub(r'\1', line)
+        if line.strip() or (kept and kept[-1].strip()):
+            kept.append(line.rstrip())
+
+    pruned = truncate_tokens("\n".join(kept).strip(), max_tokens)
+    if not pruned:
+        pruned = truncate_tokens(markdown, max_tokens)  # heuristik gagal, pakai markdown asli (tetap di-cap)
+
+    logger.info(
+        f"✂️ Pruned {page_type} markdown {url}: {count_tokens(markdown)} -> {count_tokens(pruned)} tokens"
+    )
+    return pruned
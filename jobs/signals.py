@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# dikirim setelah save_jobs (bulk upsert), yang tidak memicu post_save per job.
+# Argumen: job_ids (list id string job yang dibuat/diupdate)
+jobs_bulk_saved = Signal()
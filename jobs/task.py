@@ -1,220 +1,539 @@
-import asyncio
-import time
-import hashlib
-from urllib.parse import quote_plus
-from crawl4ai import AsyncWebCrawler
-from core.ai.crawl import client, JobList, Jobs
-from huey.contrib.djhuey import periodic_task
-from huey import crontab
-from asgiref.sync import sync_to_async
-from datetime import datetime
-from core.ai.chromadb import chroma_client, embedding_function
-from jobs.utils import save_job, sanitize_collection_name
-
-
-
-import logging
-
-# Konfigurasi dasar logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler("crawler.log"),
-        logging.StreamHandler()  # agar tetap muncul di terminal
-    ]
-)
-
-logger = logging.getLogger(__name__)
-
-logger.info(time.tzname)        # Nama timezone lokal (misal: ('WIB', 'WIB'))
-logger.info(time.timezone)      # Offset dalam detik dari UTC (negatif kalau di depan UTC)
-
-
-
-MAX_JOBS_PER_KEYWORD = 5  # max job per kategori
-
-CATEGORY_KEYWORDS = {
-    "Teknologi ": [
-        "software engineer", "devops engineer", "data scientist",
-        "cybersecurity analyst", "qa engineer", "ui/ux designer", "cloud engineer",
-        "backend", "frontend", "full stack", "mobile developer", "machine learning", "data analyst", "qa tester"
-    ],
-    # "Bisnis dan Manajemen": [
-    #     "business analyst", "project manager", "product manager",
-    #     "hr specialist", "recruiter", "marketing specialist", "digital marketing",
-    #     "finance analyst", "accountant"
-    # ],
-    # "Kreatif": [
-    #     "graphic designer", "ui designer", "content writer", "copywriter",
-    #     "video editor", "social media specialist", "brand strategist"
-    # ],
-    # "Manufaktur": [
-    #     "mechanical engineer", "industrial engineer", "supply chain analyst",
-    #     "procurement specialist", "quality assurance engineer", "qa manufaktur", "qa logistik"
-    # ]
-}
-
-
-@periodic_task(crontab(hour=6, minute=20), name="crawl_jobs") # 12-00 dikurangi 7 jam
-def crawl_jobs():
-    try:
-        asyncio.run(crawl_jobs_async())
-    except Exception as e:
-        logger.info(f"Error running crawl_jobs: {e}")
-
-
-def generate_md5_hash(text: str) -> str:
-    return hashlib.md5(text.encode('utf-8')).hexdigest()
-
-async def fetch_with_retry(crawler, url, retries=2):
-    for attempt in range(retries + 1):
-        try:
-            return await crawler.arun(url)
-        except Exception as e:
-            if attempt == retries:
-                raise
-            logger.info(f"🔁 Retry {attempt+1} for {url} due to error: {e}")
-            await asyncio.sleep(2)  # jeda sebelum retry
-
-
-async def crawl_jobs_by_keywords(crawler, category, keywords, max_jobs_per_keyword):
-    logger.info(f"\n📁 Crawling category: {category.upper()}")
-    collected_jobs = []
-
-    for keyword in keywords:
-        keyword_jobs = []
-        logger.info(f"🔍 Crawling keyword: {keyword}")
-
-        base_url = f"https://www.linkedin.com/jobs/search?keywords={quote_plus(keyword)}&location=Indonesia&start={{start}}"
-        urls = [base_url.format(start=i) for i in range(0, 25, 25)]  # hanya 1 halaman
-
-        for idx, url in enumerate(urls):
-            if len(keyword_jobs) >= max_jobs_per_keyword:
-                break
-
-            logger.info(f"🌐 Crawling '{keyword}' - Page {idx + 1}")
-            try:
-                result = await crawler.arun(url)
-                await asyncio.sleep(1)  # delay 1 detik setelah crawl tiap halaman  
-
-                if not result.markdown.strip():
-                    logger.info(f"🛑 No content on page {idx + 1}, skipping.")
-                    continue
-
-                res = client.beta.chat.completions.parse(
-                    model='gpt-4o-mini',
-                    messages=[
-                        {"role": "system", "content": "Extract job list from the given text"},
-                        {"role": "user", "content": result.markdown},
-                    ],
-                    response_format=JobList,
-                )
-
-                parsed = res.choices[0].message.parsed
-                logger.info(f"  ✅ Found {len(parsed.jobs)} jobs on page {idx + 1}")
-
-                remaining = max_jobs_per_keyword - len(keyword_jobs)
-                keyword_jobs.extend(parsed.jobs[:remaining])
-
-            except Exception as e:
-                logger.info(f"  ❌ Failed to crawl page {idx + 1}: {e}")
-
-        logger.info(f"  ✅ Collected {len(keyword_jobs)} jobs for keyword '{keyword}'")
-
-        collection_name = sanitize_collection_name(f"jobs_{category}")
-        collection = chroma_client.get_or_create_collection(
-            name=collection_name,
-            embedding_function=embedding_function
-        )
-
-
-        for idx, job in enumerate(keyword_jobs, start=1):
-            try:
-                logger.info(f"\n➡️ Processing job {idx}: {job.job_title} at {job.company_name}")
-
-                result = await crawler.arun(job.url)
-
-                res = client.beta.chat.completions.parse(
-                    model='gpt-4o-mini',
-                    messages=[
-                        {"role": "system", "content": "Extract job detail from the given text"},
-                        {"role": "user", "content": result.markdown},
-                    ],
-                    response_format=Jobs,
-                )
-
-                job_data = res.choices[0].message.parsed
-                job_json = job_data.model_dump()
-                job_json['category'] = category
-                logger.info("  ✅ Job data parsed successfully.")
-                logger.info(f"Job data: {job_json}")
-
-                job_instance = await sync_to_async(save_job)(job_json)
-                job_id = str(job_instance.id)
-                logger.info(f"  ✅ Job '{job.job_title}' saved to DB.")
-
-                # ⬇️ Tambahkan ke Chroma langsung
-                try:
-                    document = {
-                        "job_id": job_id,
-                        "category": job_json["category"],
-                        "company_name": job_json["company_name"],
-                        "job_description": job_json["job_description"],
-                        "job_title": job_json["job_title"],
-                        "job_type": job_json["job_type"],
-                        "education_level": job_json["education_level"],
-                        "experience_level": job_json["experience_level"],
-                        "skills_required": job_json["skills_required"],
-                        "salary": job_json["salary"],
-                        "date_posted": job_json["date_posted"],
-                    }
-
-                    metadata = {
-                        "job_id": job_id,
-                        "job_title": job_json["job_title"],
-                        "company_name": job_json["company_name"],
-                    }
-
-                    existing_data = collection.get(ids=[job_id])
-                    if existing_data and existing_data.get("ids"):
-                        collection.delete(ids=[job_id])
-
-                    collection.add(
-                        ids=[job_id],
-                        metadatas=[metadata],
-                        documents=[str(document)],
-                    )
-                    logger.info(f"  ✅ Uploaded job '{job.job_title}' to ChromaDB.")
-                except Exception as e:
-                    logger.info(f"  ❌ Failed to upload job '{job.job_title}' to ChromaDB: {e}")
-
-            except Exception as e:
-                logger.info(f"❌ Error processing job '{job.job_title}': {e}")
-        logger.info(f"🕒 Sleeping 2s after keyword '{keyword}'")
-        await asyncio.sleep(2)
-
-    return collected_jobs
-
-async def crawl_and_upload_category(crawler, category, keywords):
-    try:
-        await crawl_jobs_by_keywords(crawler, category, keywords, MAX_JOBS_PER_KEYWORD)
-    except Exception as e:
-        logger.info(f"❌ Error during crawling/uploading category {category}: {e}")
-
-
-
-async def crawl_jobs_async():
-    start_time = time.time()
-    logger.info(f"[{datetime.now()}] crawl_jobs_async running...")
-
-    async with AsyncWebCrawler() as crawler:
-        tasks = [
-            crawl_and_upload_category(crawler, category, keywords)
-            for category, keywords in CATEGORY_KEYWORDS.items()
-        ]
-        await asyncio.gather(*tasks)
-
-    elapsed = time.time() - start_time
-    logger.info(f"\n⏱️ Total waktu crawling dan upload: {int(elapsed // 60)} menit {int(elapsed % 60)} detik")
-
+import asyncio
+import os
+import time
+import hashlib
+from urllib.parse import quote_plus
+from core.ai.crawl import make_async_client, JobList, Jobs, JobDetailFields
+from core.queues import crawl_queue
+from huey import crontab
+from asgiref.sync import sync_to_async
+from datetime import datetime
+from core.ai.chromadb import chroma_client, embedding_function
+from jobs.utils import (
+    save_jobs, sanitize_collection_name, KnownJobIndex, normalize_page_markdown, touch_unchanged_job
+)
+from jobs.pruning import prune_markdown
+from core.ai.tokens import truncate_tokens
+from jobs.frontier import CrawlFrontier, CRAWL_SHARD_STALE_MINUTES
+from jobs.archive import PageArchive, RecordingCrawler
+from jobs.fetch import CrawlFetcher, FETCH_CONCURRENCY
+from jobs.parsers import (
+    parse_listing_html, parse_detail_html, is_complete, ExtractionStats, REQUIRED_DETAIL_FIELDS,
+    MATCHING_DETAIL_FIELDS
+)
+
+
+
+import logging
+
+# Konfigurasi dasar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    handlers=[
+        logging.FileHandler("crawler.log"),
+        logging.StreamHandler()  # agar tetap muncul di terminal
+    ]
+)
+
+logger = logging.getLogger(__name__)
+
+logger.info(time.tzname)        # Nama timezone lokal (misal: ('WIB', 'WIB'))
+logger.info(time.timezone)      # Offset dalam detik dari UTC (negatif kalau di depan UTC)
+
+
+
+MAX_JOBS_PER_KEYWORD = 5  # max job per kategori
+LLM_CONCURRENCY = int(os.getenv("CRAWL_LLM_CONCURRENCY", 4))  # max panggilan LLM bersamaan
+CRAWL_REFRESH_DAYS = int(os.getenv("CRAWL_REFRESH_DAYS", 7))  # lowongan yang diupdate < N hari lalu tidak di-crawl ulang
+WRITE_BATCH_SIZE = int(os.getenv("CRAWL_WRITE_BATCH_SIZE", 20))  # jumlah job per bulk upsert ke Postgres/Chroma
+FILL_FIELDS_MAX_TOKENS = int(os.getenv("CRAWL_FILL_FIELDS_MAX_TOKENS", 1500))  # deskripsi yang dikirim untuk isi field matching
+CRAWL_RECORD_DIR = os.getenv("CRAWL_RECORD_DIR")  # kalau di-set, halaman yang di-fetch direkam ke arsip (lihat jobs/archive.py)
+
+CATEGORY_KEYWORDS = {
+    "Teknologi ": [
+        "software engineer", "devops engineer", "data scientist",
+        "cybersecurity analyst", "qa engineer", "ui/ux designer", "cloud engineer",
+        "backend", "frontend", "full stack", "mobile developer", "machine learning", "data analyst", "qa tester"
+    ],
+    "Bisnis dan Manajemen": [
+        "business analyst", "project manager", "product manager",
+        "hr specialist", "recruiter", "marketing specialist", "digital marketing",
+        "finance analyst", "accountant"
+    ],
+    "Kreatif": [
+        "graphic designer", "ui designer", "content writer", "copywriter",
+        "video editor", "social media specialist", "brand strategist"
+    ],
+    # nama kategori harus sama dengan kategori hasil AnalyzeCV, supaya collection-nya ketemu saat matching
+    "Industri dan Manufaktur": [
+        "mechanical engineer", "industrial engineer", "supply chain analyst",
+        "procurement specialist", "quality assurance engineer", "qa manufaktur", "qa logistik"
+    ]
+}
+
+
+# coordinator: satu task huey per shard (kategori, keyword), supaya crawling bisa jalan
+# paralel di semua worker / mesin. Shard yang sudah selesai di run yang sama tidak diantrikan lagi.
+@crawl_queue.periodic_task(crontab(hour=6, minute=20), name="crawl_jobs") # 12-00 dikurangi 7 jam
+def crawl_jobs():
+    frontier = CrawlFrontier.resume_or_start()
+    shards = frontier.plan_shards(CATEGORY_KEYWORDS)
+    for category, keyword in shards:
+        crawl_shard(frontier.run.id, category, keyword)
+    logger.info(f"📤 Enqueued {len(shards)} crawl shards for run {frontier.run.id}")
+
+
+# run yang terputus (worker restart membuang task shard yang sedang/akan jalan) dilanjutkan
+# di sini, tidak menunggu jadwal crawl_jobs berikutnya (yang sudah lewat CRAWL_RESUME_HOURS)
+@crawl_queue.periodic_task(crontab(minute="*/30"), name="resume_crawl")
+def resume_crawl():
+    frontier = CrawlFrontier.resume()
+    if frontier is None:
+        return
+    shards = frontier.plan_shards(CATEGORY_KEYWORDS, stale_minutes=CRAWL_SHARD_STALE_MINUTES)
+    for category, keyword in shards:
+        crawl_shard(frontier.run.id, category, keyword)
+    if shards:
+        logger.info(f"📤 Re-enqueued {len(shards)} stale crawl shards for run {frontier.run.id}")
+        return
+
+    # semua shard selesai tapi run belum ditutup (mis. worker mati setelah shard terakhir)
+    aggregate = frontier.finish_run()
+    if aggregate:
+        report_crawl_run(frontier.run, aggregate)
+
+
+# retry akan melanjutkan shard dari checkpoint (lihat jobs/frontier.py). Setelah retry habis,
+# lowongan yang tetap gagal (authwall, 404, parse error) ditandai failed dan shard tetap ditutup,
+# supaya satu lowongan tidak menahan agregasi seluruh run.
+@crawl_queue.task(retries=2, retry_delay=600, context=True, name="crawl_shard")
+def crawl_shard(run_id, category, keyword, task=None):
+    last_attempt = task is None or task.retries == 0
+    frontier = CrawlFrontier.for_run(run_id)
+    status = 'done'
+    try:
+        frontier.touch_shard(category, keyword)
+        summary = asyncio.run(crawl_shard_async(frontier, category, keyword))
+    except Exception as e:
+        logger.info(f"Error running crawl shard {category}/{keyword}: {e}")
+        if not last_attempt:
+            raise
+        summary = {"jobs": 0, "stats": {}, "error": str(e)}
+        status = 'failed'
+
+    if summary.get("queued") and not last_attempt:
+        raise RuntimeError(f"{summary['queued']} jobs for '{keyword}' were not saved, shard will be retried")
+
+    summary["failed"] = frontier.fail_queued_jobs(category, keyword)
+    if summary["failed"] or status == 'failed':
+        logger.info(f"⚠️ Shard {category.strip()}/{keyword} closed as {status} with {summary['failed']} failed jobs")
+
+    aggregate = frontier.complete_shard(category, keyword, summary, status)
+    if aggregate:
+        report_crawl_run(frontier.run, aggregate)
+
+
+def report_crawl_run(run, aggregate):
+    stats = ExtractionStats()
+    for counts in aggregate["stats"]:
+        stats.merge(counts)
+
+    logger.info(
+        f"📦 Crawl run {run.id}: {aggregate['jobs']} jobs from {aggregate['shards']} shards "
+        f"({aggregate.get('failed_jobs', 0)} failed jobs, {aggregate.get('failed_shards', 0)} failed shards)"
+    )
+    for category, total in aggregate["categories"].items():
+        logger.info(f"  📁 {category.strip()}: {total} jobs")
+    stats.report()
+    elapsed = (run.finished_at - run.started_at).total_seconds()
+    logger.info(f"\n⏱️ Total waktu crawling dan upload: {int(elapsed // 60)} menit {int(elapsed % 60)} detik")
+
+
+def generate_md5_hash(text: str) -> str:
+    return hashlib.md5(text.encode('utf-8')).hexdigest()
+
+async def fetch_with_retry(crawler, url, retries=2):
+    for attempt in range(retries + 1):
+        try:
+            return await crawler.arun(url)
+        except Exception as e:
+            if attempt == retries:
+                raise
+            logger.info(f"🔁 Retry {attempt+1} for {url} due to error: {e}")
+            await asyncio.sleep(2)  # jeda sebelum retry
+
+
+class OpenAIExtractor:
+    """Ekstraksi lowongan lewat OpenAI, dengan client milik satu crawl shard (tutup dengan aclose)."""
+
+    def __init__(self):
+        self.client = make_async_client()
+
+    async def __call__(self, instruction, markdown, schema, url, page_type):
+        res = await self.client.beta.chat.completions.parse(
+            model='gpt-4o-mini',
+            messages=[
+                {"role": "system", "content": instruction},
+                {"role": "user", "content": markdown},
+            ],
+            response_format=schema,
+        )
+        return res.choices[0].message.parsed
+
+    async def aclose(self):
+        await self.client.close()
+
+
+class JobStore:
+    """Penyimpanan hasil crawl: Postgres untuk data lowongan, Chroma untuk embedding."""
+
+    def get_collection(self, category):
+        return chroma_client.get_or_create_collection(
+            name=sanitize_collection_name(f"jobs_{category}"),
+            embedding_function=embedding_function
+        )
+
+    def is_unchanged(self, url, content_hash):
+        return touch_unchanged_job(url, content_hash)
+
+    def save_many(self, job_jsons):
+        return save_jobs(job_jsons)
+
+    def upload_many(self, collection, job_ids, job_jsons):
+        upload_jobs_to_chroma(collection, job_ids, job_jsons)
+
+
+class JobBatchWriter:
+    """
+    Kumpulkan job hasil ekstraksi lalu tulis per batch: satu bulk upsert ke Postgres
+    (satu panggilan thread pool), lalu satu upsert ke Chroma dengan id hasil upsert tsb.
+    """
+
+    def __init__(self, ctx, batch_size=WRITE_BATCH_SIZE):
+        self.ctx = ctx
+        self.batch_size = batch_size
+        self.pending = []  # (collection, job_json)
+        self.job_ids = []
+
+    async def add(self, collection, job_json):
+        self.pending.append((collection, job_json))
+        if len(self.pending) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        batch, self.pending = self.pending, []
+        if not batch:
+            return
+
+        job_jsons = [job_json for _, job_json in batch]
+        try:
+            ids_by_url = await sync_to_async(self.ctx.store.save_many)(job_jsons)
+        except Exception as e:
+            # job tetap 'queued' di frontier, shard gagal dan diulang huey (lihat crawl_shard_async)
+            logger.info(f"  ❌ Failed to save batch of {len(batch)} jobs: {e}")
+            return
+        logger.info(f"  ✅ Saved batch of {len(ids_by_url)} jobs to DB.")
+
+        # kelompokkan per collection (kategori) untuk upsert Chroma
+        by_collection = {}
+        for collection, job_json in batch:
+            job_id = ids_by_url.get(job_json["url"])
+            if job_id:
+                by_collection.setdefault(id(collection), (collection, {}))[1][job_id] = job_json
+
+        for collection, jobs in by_collection.values():
+            try:
+                await asyncio.to_thread(
+                    self.ctx.store.upload_many, collection, list(jobs), list(jobs.values())
+                )
+                logger.info(f"  ✅ Uploaded {len(jobs)} jobs to ChromaDB.")
+            except Exception as e:
+                logger.info(f"  ❌ Failed to upload {len(jobs)} jobs to ChromaDB: {e}")
+
+        self.job_ids.extend(ids_by_url.values())
+        await sync_to_async(self.ctx.frontier.mark_extracted_many)(
+            [job_json["source_url"] for job_json in job_jsons]
+        )
+
+
+class CrawlContext:
+    """
+    State bersama untuk satu kali crawling: crawler, extractor LLM, batas konkurensi,
+    index lowongan yang sudah dikenal, checkpoint frontier dan statistik ekstraksi.
+    llm (OpenAIExtractor, atau ReplayLLM untuk replay offline), store dan archive bisa
+    diganti (lihat jobs/archive.py).
+    Semaphore harus dibuat di dalam event loop yang menjalankan crawl.
+    """
+
+    def __init__(self, crawler, known_jobs, frontier, llm, store=None, archive=None,
+                 page_delay=1, keyword_delay=2):
+        self.crawler = crawler
+        self.known_jobs = known_jobs
+        self.frontier = frontier
+        self.llm = llm
+        self.store = store or JobStore()
+        self.archive = archive
+        self.page_delay = page_delay
+        self.keyword_delay = keyword_delay
+        self.fetch_semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+        self.llm_semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+        self.stats = ExtractionStats()
+        self.writer = JobBatchWriter(self)
+
+    @classmethod
+    async def create(cls, crawler, frontier, **kwargs):
+        known_jobs = await sync_to_async(KnownJobIndex.load)(CRAWL_REFRESH_DAYS)
+        logger.info(f"📇 Loaded {len(known_jobs)} known job urls (refresh window {CRAWL_REFRESH_DAYS} hari)")
+        return cls(crawler, known_jobs, frontier, **kwargs)
+
+    async def fetch(self, url):
+        async with self.fetch_semaphore:
+            return await fetch_with_retry(self.crawler, url)
+
+
+async def extract_with_llm(ctx, instruction, markdown, schema, url, page_type):
+    # panggilan LLM dibatasi semaphore sendiri, terpisah dari fetch halaman
+    async with ctx.llm_semaphore:
+        return await ctx.llm(instruction, markdown, schema, url, page_type)
+
+
+async def extract_listing(ctx, result):
+    # parser lokal dulu, LLM hanya kalau tidak ada lowongan yang lengkap
+    jobs = parse_listing_html(result.html)
+    if jobs:
+        ctx.stats.record("listing", "local")
+    else:
+        ctx.stats.record("listing", "llm")
+        markdown = prune_markdown(result.markdown, "listing", result.url)
+        parsed = await extract_with_llm(
+            ctx, "Extract job list from the given text", markdown, JobList, result.url, "listing"
+        )
+        jobs = parsed.jobs
+
+    if ctx.archive:
+        ctx.archive.add_extraction(result.url, "listing", [job.model_dump() for job in jobs])
+    return jobs
+
+
+async def fill_missing_fields(ctx, job_data, url):
+    """
+    Parse lokal lengkap tapi field untuk matching (skill, pendidikan, ukuran perusahaan)
+    kosong: isi dengan panggilan LLM kecil dari deskripsi saja, bukan ekstraksi ulang halaman.
+    """
+    missing = [field for field in MATCHING_DETAIL_FIELDS if not is_complete(job_data, (field,))]
+    if not missing:
+        ctx.stats.record("detail_fields", "local")
+        return job_data
+
+    ctx.stats.record("detail_fields", "llm")
+    fields = await extract_with_llm(
+        ctx,
+        "Extract the required skills, education level and company size of this job from the given description",
+        truncate_tokens(job_data.job_description, FILL_FIELDS_MAX_TOKENS), JobDetailFields, url, "detail_fields",
+    )
+    if ctx.archive:
+        ctx.archive.add_extraction(url, "detail_fields", fields.model_dump())
+    return job_data.model_copy(update={field: getattr(fields, field) for field in missing})
+
+
+async def extract_detail(ctx, result, url, markdown=None):
+    # markdown: hasil prune_markdown halaman ini kalau sudah dihitung pemanggil
+    job_data = parse_detail_html(result.html, url)
+    if is_complete(job_data, REQUIRED_DETAIL_FIELDS):
+        ctx.stats.record("detail", "local")
+        job_data = await fill_missing_fields(ctx, job_data, url)
+    else:
+        ctx.stats.record("detail", "llm")
+        if markdown is None:
+            markdown = prune_markdown(result.markdown, "detail", url)
+        job_data = await extract_with_llm(
+            ctx, "Extract job detail from the given text", markdown, Jobs, url, "detail"
+        )
+
+    if ctx.archive:
+        ctx.archive.add_extraction(url, "detail", job_data.model_dump())
+    return job_data
+
+
+def chroma_record(job_id, job_json):
+    document = {
+        "job_id": job_id,
+        "category": job_json["category"],
+        "company_name": job_json["company_name"],
+        "job_description": job_json["job_description"],
+        "job_title": job_json["job_title"],
+        "job_type": job_json["job_type"],
+        "education_level": job_json["education_level"],
+        "experience_level": job_json["experience_level"],
+        "skills_required": job_json["skills_required"],
+        "salary": job_json["salary"],
+        "date_posted": job_json["date_posted"],
+    }
+
+    metadata = {
+        "job_id": job_id,
+        "job_title": job_json["job_title"],
+        "company_name": job_json["company_name"],
+    }
+    return str(document), metadata
+
+
+def upload_jobs_to_chroma(collection, job_ids, job_jsons):
+    records = [chroma_record(job_id, job_json) for job_id, job_json in zip(job_ids, job_jsons)]
+    collection.upsert(
+        ids=list(job_ids),
+        documents=[document for document, _ in records],
+        metadatas=[metadata for _, metadata in records],
+    )
+
+
+async def process_job(ctx, collection, category, job, idx):
+    """
+    Pipeline satu lowongan: fetch -> extract -> save -> embed.
+    Tiap lowongan berjalan sebagai task sendiri sehingga tahap-tahapnya saling overlap;
+    save dan embed dikerjakan per batch oleh ctx.writer.
+    """
+    try:
+        logger.info(f"\n➡️ Processing job {idx}: {job.job_title} at {job.company_name}")
+
+        result = await ctx.fetch(job.url)
+
+        # hash hanya bagian lowongan (tanpa "similar jobs", "people also viewed", footer),
+        # karena blok rekomendasi berganti tiap crawl walaupun lowongannya sama
+        job_markdown = prune_markdown(result.markdown, "detail", job.url)
+        normalized = normalize_page_markdown(job_markdown)
+        content_hash = generate_md5_hash(normalized) if normalized else None
+        if await sync_to_async(ctx.store.is_unchanged)(job.url, content_hash):
+            logger.info(f"  ⏭️ Job '{job.job_title}' unchanged (hash {content_hash}), only last_seen_at updated.")
+            await sync_to_async(ctx.frontier.mark_extracted)(job.url)
+            return
+
+        job_data = await extract_detail(ctx, result, job.url, job_markdown)
+        job_json = job_data.model_dump()
+        job_json['category'] = category
+        job_json['source_url'] = job.url
+        job_json['content_hash'] = content_hash
+        if not job_json.get('url', '').startswith('http'):
+            job_json['url'] = job.url  # link apply tidak ditemukan, pakai url listing
+        logger.info("  ✅ Job data parsed successfully.")
+        logger.info(f"Job data: {job_json}")
+
+        await ctx.writer.add(collection, job_json)
+
+    except Exception as e:
+        logger.info(f"❌ Error processing job '{job.job_title}': {e}")
+
+
+async def crawl_jobs_by_keywords(ctx, category, keywords, max_jobs_per_keyword):
+    logger.info(f"\n📁 Crawling category: {category.upper()}")
+
+    collection = await asyncio.to_thread(ctx.store.get_collection, category)
+
+    job_tasks = []
+
+    # lanjutkan url yang sudah antri tapi belum diekstrak di run sebelumnya
+    pending_jobs = await sync_to_async(ctx.frontier.pending_jobs)(category, keywords)
+    if pending_jobs:
+        logger.info(f"♻️ Resuming {len(pending_jobs)} queued jobs for category {category}")
+    for idx, job in enumerate(pending_jobs, start=1):
+        ctx.known_jobs.add(job.url)
+        job_tasks.append(asyncio.create_task(process_job(ctx, collection, category, job, idx)))
+
+    done_keywords = await sync_to_async(ctx.frontier.done_keywords)(category)
+
+    for keyword in keywords:
+        if CrawlFrontier.keyword_key(category, keyword) in done_keywords:
+            logger.info(f"⏭️ Keyword '{keyword}' already crawled in this run, skipping.")
+            continue
+
+        keyword_jobs = []
+        listing_failed = False
+        logger.info(f"🔍 Crawling keyword: {keyword}")
+
+        base_url = f"https://www.linkedin.com/jobs/search?keywords={quote_plus(keyword)}&location=Indonesia&start={{start}}"
+        urls = [base_url.format(start=i) for i in range(0, 25, 25)]  # hanya 1 halaman
+
+        for idx, url in enumerate(urls):
+            if len(keyword_jobs) >= max_jobs_per_keyword:
+                break
+
+            logger.info(f"🌐 Crawling '{keyword}' - Page {idx + 1}")
+            try:
+                async with ctx.fetch_semaphore:
+                    result = await ctx.crawler.arun(url)
+                await asyncio.sleep(ctx.page_delay)  # delay 1 detik setelah crawl tiap halaman  
+
+                if not result.markdown.strip():
+                    logger.info(f"🛑 No content on page {idx + 1}, skipping.")
+                    continue
+
+                page_jobs = await extract_listing(ctx, result)
+                logger.info(f"  ✅ Found {len(page_jobs)} jobs on page {idx + 1}")
+
+                remaining = max_jobs_per_keyword - len(keyword_jobs)
+                keyword_jobs.extend(page_jobs[:remaining])
+
+            except Exception as e:
+                listing_failed = True
+                logger.info(f"  ❌ Failed to crawl page {idx + 1}: {e}")
+
+        logger.info(f"  ✅ Collected {len(keyword_jobs)} jobs for keyword '{keyword}'")
+
+        new_jobs = []
+        for job in keyword_jobs:
+            if job.url in ctx.known_jobs:
+                logger.info(f"  ⏭️ Skip known job: {job.job_title} ({job.url})")
+                continue
+            ctx.known_jobs.add(job.url)  # hindari fetch ganda dari keyword lain di run yang sama
+            new_jobs.append(job)
+
+        # keyword yang listing-nya gagal tidak ditandai selesai, supaya di-crawl ulang saat resume
+        if not listing_failed:
+            await sync_to_async(ctx.frontier.mark_keyword_listed)(category, keyword, new_jobs)
+
+        # detail lowongan diproses di background, sementara keyword berikutnya sudah mulai di-crawl
+        for idx, job in enumerate(new_jobs, start=1):
+            job_tasks.append(asyncio.create_task(process_job(ctx, collection, category, job, idx)))
+
+        logger.info(f"🕒 Sleeping {ctx.keyword_delay}s after keyword '{keyword}'")
+        await asyncio.sleep(ctx.keyword_delay)
+
+    await asyncio.gather(*job_tasks)
+    await ctx.writer.flush()
+    return list(ctx.writer.job_ids)
+
+async def crawl_shard_async(frontier, category, keyword):
+    start_time = time.time()
+    logger.info(f"[{datetime.now()}] crawl shard {category.strip()}/{keyword} running...")
+
+    llm = OpenAIExtractor()
+    try:
+        async with CrawlFetcher() as crawler:
+            if CRAWL_RECORD_DIR:
+                # record mode: simpan halaman + hasil ekstraksi untuk replay offline
+                os.makedirs(CRAWL_RECORD_DIR, exist_ok=True)
+                shard_name = sanitize_collection_name(f"{frontier.run.id}_{category}_{keyword}")
+                archive_path = os.path.join(CRAWL_RECORD_DIR, f"{shard_name}.jsonl.gz")
+                with PageArchive(archive_path) as archive:
+                    ctx = await CrawlContext.create(
+                        RecordingCrawler(crawler, archive), frontier, llm=llm, archive=archive
+                    )
+                    job_ids = await crawl_jobs_by_keywords(ctx, category, [keyword], MAX_JOBS_PER_KEYWORD)
+                logger.info(f"💾 Recorded shard pages to {archive_path}")
+            else:
+                ctx = await CrawlContext.create(crawler, frontier, llm=llm)
+                job_ids = await crawl_jobs_by_keywords(ctx, category, [keyword], MAX_JOBS_PER_KEYWORD)
+    finally:
+        await llm.aclose()  # tutup connection pool sebelum event loop shard ini ditutup
+
+    # listing gagal -> keyword belum tercatat, raise supaya huey retry shard ini
+    if not await sync_to_async(frontier.is_keyword_listed)(category, keyword):
+        raise RuntimeError(f"Listing for '{keyword}' failed, shard will be retried")
+    # lowongan yang gagal diproses masih 'queued' (crawl_shard memutuskan retry atau failed)
+    queued = await sync_to_async(frontier.queued_jobs_count)(category, keyword)
+
+    ctx.stats.report()
+    elapsed = time.time() - start_time
+    logger.info(f"⏱️ Shard {category.strip()}/{keyword} selesai dalam {int(elapsed)} detik")
+    return {"jobs": len(job_ids), "queued": queued, "stats": ctx.stats.counts}
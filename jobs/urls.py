@@ -1 +1 @@
-from django.urls import path
+from django.urls import path
@@ -1,80 +1,204 @@
-import re
-from .models import Job
-from core.ai.chromadb import chroma_client, embedding_function
-from datetime import datetime
-
-def sanitize_collection_name(name: str) -> str:
-    """
-    Sanitize category name to be a valid ChromaDB collection name:
-    - Replace all non-alphanumeric characters with underscores
-    - Strip leading/trailing underscores
-    - Ensure length between 3 and 512
-    """
-    # Lowercase and replace non-alphanumeric characters with underscores
-    sanitized = re.sub(r'[^a-zA-Z0-9._-]', '_', name.lower())
-    sanitized = re.sub(r'_+', '_', sanitized)  # Replace multiple underscores with single
-    sanitized = sanitized.strip('_')
-
-    # Ensure name starts and ends with alphanumeric character
-    if not re.match(r'^[a-zA-Z0-9].*[a-zA-Z0-9]$', sanitized):
-        raise ValueError(f"Invalid sanitized name: {sanitized}")
-
-    # Validate length
-    if len(sanitized) < 3 or len(sanitized) > 512:
-        raise ValueError(f"Collection name must be 3-512 characters: {sanitized}")
-
-    return sanitized
-
-# def get_collection_and_delete_by_category(category_name: str):
-#     collection_name = sanitize_collection_name(f"jobs_{category_name}")
-
-#     # Ambil nama-nama collection yang sudah ada
-#     existing_collections = [col.name for col in chroma_client.list_collections()]
-
-#     if collection_name in existing_collections:
-#         chroma_client.delete_collection(name=collection_name)
-
-#     return chroma_client.get_or_create_collection(
-#         name=collection_name,
-#         embedding_function=embedding_function
-#     )
-
-def get_collection_by_category(category_name: str):
-    collection_name = sanitize_collection_name(f"jobs_{category_name}")
-
-    return chroma_client.get_or_create_collection(
-        name=collection_name,
-        embedding_function=embedding_function
-    )
-
-
-def save_job(job_json: dict) -> Job:
-    job, created = Job.objects.update_or_create(
-        url=job_json.get("url"),
-        defaults={
-            "category": job_json.get("category"),
-            "job_title": job_json.get("job_title"),
-            "company_name": job_json.get("company_name"),
-            "company_industry": job_json.get("industry"),
-            "company_employee_size": job_json.get("company_size"),
-            "company_desc": job_json.get("company_desc"),
-            "location": job_json.get("location"),
-            "url": job_json.get("url"),
-            "job_type": job_json.get("job_type"),
-            "experience_level": job_json.get("experience_level"),
-            "education_level": job_json.get("education_level"),
-            "skills_required": job_json.get("skills_required"),
-            "salary": job_json.get("salary"),
-            "date_posted": job_json.get("date_posted"),
-            "job_description": job_json.get("job_description"),
-            "uploaded_to_vector_db": False,
-        }
-    )
-    return job
-
-def get_jobs_not_uploaded():
-    return list(Job.objects.filter(uploaded_to_vector_db=False))
-
-
-def mark_job_uploaded(job_id: int):
-    Job.objects.filter(id=job_id).update(uploaded_to_vector_db=True)
+import re
+from django.db.models import Q
+from .models import Job
+from .signals import jobs_bulk_saved
+from core.ai.chromadb import chroma_client, embedding_function
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+def sanitize_collection_name(name: str) -> str:
+    """
+    Sanitize category name to be a valid ChromaDB collection name:
+    - Replace all non-alphanumeric characters with underscores
+    - Strip leading/trailing underscores
+    - Ensure length between 3 and 512
+    """
+    # Lowercase and replace non-alphanumeric characters with underscores
+    sanitized = re.sub(r'[^a-zA-Z0-9._-]', '_', name.lower())
+    sanitized = re.sub(r'_+', '_', sanitized)  # Replace multiple underscores with single
+    sanitized = sanitized.strip('_')
+
+    # Ensure name starts and ends with alphanumeric character
+    if not re.match(r'^[a-zA-Z0-9].*[a-zA-Z0-9]$', sanitized):
+        raise ValueError(f"Invalid sanitized name: {sanitized}")
+
+    # Validate length
+    if len(sanitized) < 3 or len(sanitized) > 512:
+        raise ValueError(f"Collection name must be 3-512 characters: {sanitized}")
+
+    return sanitized
+
+# def get_collection_and_delete_by_category(category_name: str):
+#     collection_name = sanitize_collection_name(f"jobs_{category_name}")
+
+#     # Ambil nama-nama collection yang sudah ada
+#     existing_collections = [col.name for col in chroma_client.list_collections()]
+
+#     if collection_name in existing_collections:
+#         chroma_client.delete_collection(name=collection_name)
+
+#     return chroma_client.get_or_create_collection(
+#         name=collection_name,
+#         embedding_function=embedding_function
+#     )
+
+def get_collection_by_category(category_name: str):
+    collection_name = sanitize_collection_name(f"jobs_{category_name}")
+
+    return chroma_client.get_or_create_collection(
+        name=collection_name,
+        embedding_function=embedding_function
+    )
+
+
+def job_defaults(job_json: dict) -> dict:
+    return {
+        "category": job_json.get("category"),
+        "job_title": job_json.get("job_title"),
+        "company_name": job_json.get("company_name"),
+        "company_industry": job_json.get("industry"),
+        "company_employee_size": job_json.get("company_size"),
+        "company_desc": job_json.get("company_desc"),
+        "location": job_json.get("location"),
+        "url": job_json.get("url"),
+        "source_url": job_json.get("source_url"),
+        "job_type": job_json.get("job_type"),
+        "experience_level": job_json.get("experience_level"),
+        "education_level": job_json.get("education_level"),
+        "skills_required": job_json.get("skills_required"),
+        "salary": job_json.get("salary"),
+        "date_posted": job_json.get("date_posted"),
+        "job_description": job_json.get("job_description"),
+        "uploaded_to_vector_db": False,
+        "content_hash": job_json.get("content_hash"),
+        "last_seen_at": datetime.now(),
+    }
+
+
+def save_job(job_json: dict) -> Job:
+    job, created = Job.objects.update_or_create(
+        url=job_json.get("url"),
+        defaults=job_defaults(job_json)
+    )
+    return job
+
+
+def save_jobs(job_jsons: list) -> dict:
+    """
+    Upsert banyak job sekaligus (satu INSERT ... ON CONFLICT (url) DO UPDATE).
+    Return dict url -> job id (string), termasuk id job lama yang di-update.
+    """
+    # url duplikat dalam satu batch tidak boleh (ON CONFLICT tidak bisa update row yang sama 2x)
+    by_url = {job_json.get("url"): job_json for job_json in job_jsons}
+    jobs = [Job(**job_defaults(job_json)) for job_json in by_url.values()]
+    update_fields = [field for field in job_defaults({}) if field != "url"] + ["updated_at"]
+
+    Job.objects.bulk_create(
+        jobs,
+        update_conflicts=True,
+        unique_fields=["url"],
+        update_fields=update_fields,
+    )
+    # id diambil ulang dari DB, karena row yang konflik tetap memakai id lama
+    rows = Job.objects.filter(url__in=list(by_url)).values_list("url", "id")
+    ids_by_url = {url: str(job_id) for url, job_id in rows}
+    jobs_bulk_saved.send(sender=Job, job_ids=list(ids_by_url.values()))
+    return ids_by_url
+
+# id lowongan = deret angka terakhir di segmen /jobs/view/<slug>-<id> (slug bisa berisi
+# angka lain, mis. tahun atau gaji), atau nilai param currentJobId
+LINKEDIN_JOB_ID_RE = re.compile(r'(?:/jobs/view/(?:[^/?#]*-)?|currentJobId=)(\d{6,})(?=[/?#&]|$)')
+
+
+def extract_linkedin_job_id(url: str):
+    if not url:
+        return None
+    match = LINKEDIN_JOB_ID_RE.search(url)
+    return match.group(1) if match else None
+
+
+def normalize_job_url(url: str) -> str:
+    """
+    Normalisasi URL lowongan jadi key yang stabil:
+    - URL LinkedIn -> "linkedin:<job id>" (subdomain, slug dan tracking param diabaikan)
+    - URL lain -> host + path tanpa query/fragment, lowercase
+    """
+    if not url:
+        return ""
+    job_id = extract_linkedin_job_id(url)
+    if job_id:
+        return f"linkedin:{job_id}"
+    parts = urlsplit(url.strip())
+    return f"{parts.netloc.lower()}{parts.path.rstrip('/')}".lower()
+
+
+# bagian halaman yang berubah tiap hari tanpa mengubah isi lowongan
+VOLATILE_PATTERNS = [
+    re.compile(r'\b\d+\s+(?:second|minute|hour|day|week|month)s?\s+ago\b'),
+    re.compile(r'\b(?:over\s+)?\d+\s+applicants?\b'),
+    re.compile(r'\b(?:be among the first \d+ applicants|actively recruiting|reposted)\b'),
+    re.compile(r'\?[^\s)\]]*'),  # query string (tracking id) di link
+]
+
+
+def normalize_page_markdown(markdown: str) -> str:
+    text = (markdown or "").lower()
+    for pattern in VOLATILE_PATTERNS:
+        text = pattern.sub('', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def touch_unchanged_job(url: str, content_hash: str) -> bool:
+    """
+    Kalau lowongan ini (url listing / url apply) sudah tersimpan dengan hash konten yang sama,
+    cukup update last_seen_at. Return True jika job tidak berubah (ekstraksi, save dan upsert
+    Chroma bisa di-skip). Hash kosong (halaman kosong / authwall) tidak pernah dianggap sama.
+    """
+    if not url or not content_hash:
+        return False
+    return Job.objects.filter(
+        Q(source_url=url) | Q(url=url), content_hash=content_hash
+    ).update(last_seen_at=datetime.now()) > 0
+
+
+class KnownJobIndex:
+    """
+    Index URL lowongan yang sudah ada di DB dan masih dalam refresh window,
+    dipakai crawler untuk skip fetch detail + ekstraksi LLM lowongan yang sudah dikenal.
+    """
+
+    def __init__(self, keys=None):
+        self.keys = set(keys or [])
+
+    @classmethod
+    def load(cls, refresh_days: int):
+        since = datetime.now() - timedelta(days=refresh_days)
+        rows = Job.objects.filter(
+            Q(updated_at__gte=since) | Q(last_seen_at__gte=since)
+        ).values_list("url", "source_url")
+        keys = set()
+        for url, source_url in rows:
+            for value in (url, source_url):
+                key = normalize_job_url(value)
+                if key:
+                    keys.add(key)
+        return cls(keys)
+
+    def __contains__(self, url):
+        return normalize_job_url(url) in self.keys
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, url):
+        key = normalize_job_url(url)
+        if key:
+            self.keys.add(key)
+
+
+def get_jobs_not_uploaded():
+    return list(Job.objects.filter(uploaded_to_vector_db=False))
+
+
+def mark_job_uploaded(job_id: int):
+    Job.objects.filter(id=job_id).update(uploaded_to_vector_db=True)
@@ -1,6 +1,6 @@
-from django.urls import path
-from .views import JobRecommendationView
-
-urlpatterns = [
-    path('recommendations/', JobRecommendationView.as_view(), name='job-recommendations'),
+from django.urls import path
+from .views import JobRecommendationView
+
+urlpatterns = [
+    path('recommendations/', JobRecommendationView.as_view(), name='job-recommendations'),
 ]
\ No newline at end of file
@@ -1,17 +1,34 @@
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
-import logging
-
-logger = logging.getLogger(__name__)
-
-def send_notification(data: dict):
-    try:
-        channel = get_channel_layer()
-        async_to_sync(channel.group_send)('notification', {
-            "type": 'send_notification',
-            "data": data,
-        })
-    except Exception as e:
-        logger.warning(f"Failed to send notification: {e}")
-        # Continue without failing the main process
-        pass
\ No newline at end of file
+from channels.layers import get_channel_layer
+from asgiref.sync import async_to_sync
+import logging
+
+logger = logging.getLogger(__name__)
+
+# group yang diikuti semua socket notifikasi, hanya untuk pengumuman ke semua user
+BROADCAST_GROUP = 'notification'
+
+
+def user_group(user_id):
+    """Group notifikasi milik satu user (socket yang login sebagai user itu)."""
+    return f'notification_{user_id}'
+
+
+def publish(group, data):
+    try:
+        channel = get_channel_layer()
+        async_to_sync(channel.group_send)(group, {
+            "type": 'send_notification',
+            "data": data,
+        })
+    except Exception as e:
+        logger.warning(f"Failed to send notification: {e}")
+        # Continue without failing the main process
+        pass
+
+
+def send_notification(user_id, data: dict):
+    publish(user_group(user_id), data)
+
+
+def broadcast_notification(data):
+    publish(BROADCAST_GROUP, data)
@@ -1,10 +1,11 @@
-from django.db import models
-from .methods import send_notification
-from .tasks import task_send_notification
-# Create your models here.
-class Notification(models.Model):
-    message = models.TextField()
-
-    def save(self, *args, **kwargs):
-        send_notification(self.message)
+from django.db import models
+from .methods import broadcast_notification
+from .tasks import task_send_notification
+# Create your models here.
+class Notification(models.Model):
+    message = models.TextField()
+
+    def save(self, *args, **kwargs):
+        # pengumuman dari admin: dikirim ke semua user
+        broadcast_notification(self.message)
         super().save(*args, **kwargs)
\ No newline at end of file
@@ -1,6 +1,6 @@
-from .methods import send_notification
-from huey.contrib.djhuey import task
-
-@task()
-def task_send_notification(message):
-    send_notification(message)
\ No newline at end of file
+from .methods import send_notification
+from core.queues import chat_queue, PRIORITY_HIGH
+
+@chat_queue.task(priority=PRIORITY_HIGH)
+def task_send_notification(user_id, message):
+    send_notification(user_id, message)
\ No newline at end of file
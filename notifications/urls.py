@@ -1,5 +1,5 @@
-from django.urls import path
-from .views import index_view
-urlpatterns = [
-    path("",index_view, name='index')
+from django.urls import path
+from .views import index_view
+urlpatterns = [
+    path("",index_view, name='index')
 ] 
\ No newline at end of file
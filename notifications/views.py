@@ -1,5 +1,5 @@
-from django.shortcuts import render
-
-# Create your views here.
-def index_view(request):
+from django.shortcuts import render
+
+# Create your views here.
+def index_view(request):
     return render(request, 'index.html')
\ No newline at end of file
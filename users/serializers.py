@@ -1,66 +1,66 @@
-from rest_framework import serializers
-from .models import User
-from django.contrib.auth.password_validation import validate_password
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from rest_framework_simplejwt.tokens import RefreshToken
-
-class RegisterSerializer(serializers.ModelSerializer):
-    password = serializers.CharField(write_only=True, required=True, validators=[validate_password])
-    
-    class Meta:
-        model = User
-        fields = ('name', 'email', 'password')
-    
-    def create(self, validated_data):
-        user = User.objects.create(
-            email=validated_data['email'],
-            name=validated_data['name'],
-            username=validated_data['name']
-        )
-        user.set_password(validated_data['password'])
-        user.save()
-        return user
-
-class UserSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = User
-        fields = ('id', 'name', 'email')
-
-class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
-    @classmethod
-    def get_token(cls, user):
-        token = super().get_token(user)
-        # Add custom claims
-        token['name'] = user.name
-        token['email'] = user.email
-        return token
-
-class LoginSerializer(serializers.Serializer):
-    email = serializers.EmailField(required=True)
-    password = serializers.CharField(required=True, write_only=True)
-    
-    def validate(self, attrs):
-        email = attrs.get('email')
-        password = attrs.get('password')
-        
-        try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
-            raise serializers.ValidationError("User does not exist")
-        
-        if not user.check_password(password):
-            raise serializers.ValidationError("Invalid email or password")
-        
-        refresh = RefreshToken.for_user(user)
-        
-        data = {
-            'message': 'Login successful',
-            'token': str(refresh.access_token),
-            'user': {
-                'id': str(user.id),
-                'name': user.name,
-                'email': user.email
-            }
-        }
-        
+from rest_framework import serializers
+from .models import User
+from django.contrib.auth.password_validation import validate_password
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.tokens import RefreshToken
+
+class RegisterSerializer(serializers.ModelSerializer):
+    password = serializers.CharField(write_only=True, required=True, validators=[validate_password])
+    
+    class Meta:
+        model = User
+        fields = ('name', 'email', 'password')
+    
+    def create(self, validated_data):
+        user = User.objects.create(
+            email=validated_data['email'],
+            name=validated_data['name'],
+            username=validated_data['name']
+        )
+        user.set_password(validated_data['password'])
+        user.save()
+        return user
+
+class UserSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ('id', 'name', 'email')
+
+class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        # Add custom claims
+        token['name'] = user.name
+        token['email'] = user.email
+        return token
+
+class LoginSerializer(serializers.Serializer):
+    email = serializers.EmailField(required=True)
+    password = serializers.CharField(required=True, write_only=True)
+    
+    def validate(self, attrs):
+        email = attrs.get('email')
+        password = attrs.get('password')
+        
+        try:
+            user = User.objects.get(email=email)
+        except User.DoesNotExist:
+            raise serializers.ValidationError("User does not exist")
+        
+        if not user.check_password(password):
+            raise serializers.ValidationError("Invalid email or password")
+        
+        refresh = RefreshToken.for_user(user)
+        
+        data = {
+            'message': 'Login successful',
+            'token': str(refresh.access_token),
+            'user': {
+                'id': str(user.id),
+                'name': user.name,
+                'email': user.email
+            }
+        }
+        
         return data 
\ No newline at end of file
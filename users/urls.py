@@ -1,10 +1,10 @@
-from django.urls import path
-from .views import RegisterView, LoginView, VerifyTokenView
-from rest_framework_simplejwt.views import TokenRefreshView
-
-urlpatterns = [
-    path('register', RegisterView.as_view(), name='register'),
-    path('login', LoginView.as_view(), name='login'),
-    path('token/refresh', TokenRefreshView.as_view(), name='token_refresh'),
-    path('verify-token', VerifyTokenView.as_view(), name='verify_token'),
+from django.urls import path
+from .views import RegisterView, LoginView, VerifyTokenView
+from rest_framework_simplejwt.views import TokenRefreshView
+
+urlpatterns = [
+    path('register', RegisterView.as_view(), name='register'),
+    path('login', LoginView.as_view(), name='login'),
+    path('token/refresh', TokenRefreshView.as_view(), name='token_refresh'),
+    path('verify-token', VerifyTokenView.as_view(), name='verify_token'),
 ]
\ No newline at end of file
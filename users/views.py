@@ -1,62 +1,62 @@
-from rest_framework import status
-from rest_framework.response import Response
-from rest_framework.views import APIView
-from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework_simplejwt.authentication import JWTAuthentication
-from .serializers import RegisterSerializer, LoginSerializer
-
-# Create your views here.
-
-class RegisterView(APIView):
-    permission_classes = (AllowAny,)
-    
-    def post(self, request):
-        serializer = RegisterSerializer(data=request.data)
-        if serializer.is_valid():
-            user = serializer.save()
-            refresh = RefreshToken.for_user(user)
-            
-            return Response({
-                'message': 'User registered successfully',
-                'user_id': str(user.id),
-                'token': str(refresh.access_token),
-                'user': {
-                    'id': str(user.id),
-                    'name': user.get_full_name() or user.username,
-                    'email': user.email,
-                }
-            }, status=status.HTTP_201_CREATED)
-        
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-class LoginView(APIView):
-    permission_classes = (AllowAny,)
-    
-    def post(self, request):
-        serializer = LoginSerializer(data=request.data)
-        if serializer.is_valid():
-            return Response(serializer.validated_data, status=status.HTTP_200_OK)
-        
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-class VerifyTokenView(APIView):
-    authentication_classes = [JWTAuthentication]
-    permission_classes = [IsAuthenticated]
-    
-    def post(self, request):
-        try:
-            user = request.user
-            
-            return Response({
-                'user': {
-                    'id': str(user.id),
-                    'name': user.get_full_name() or user.username,
-                    'email': user.email,
-                }
-            }, status=status.HTTP_200_OK)
-            
-        except Exception as e:
-            return Response({
-                'error': 'Token verification failed'
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from .serializers import RegisterSerializer, LoginSerializer
+
+# Create your views here.
+
+class RegisterView(APIView):
+    permission_classes = (AllowAny,)
+    
+    def post(self, request):
+        serializer = RegisterSerializer(data=request.data)
+        if serializer.is_valid():
+            user = serializer.save()
+            refresh = RefreshToken.for_user(user)
+            
+            return Response({
+                'message': 'User registered successfully',
+                'user_id': str(user.id),
+                'token': str(refresh.access_token),
+                'user': {
+                    'id': str(user.id),
+                    'name': user.get_full_name() or user.username,
+                    'email': user.email,
+                }
+            }, status=status.HTTP_201_CREATED)
+        
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+class LoginView(APIView):
+    permission_classes = (AllowAny,)
+    
+    def post(self, request):
+        serializer = LoginSerializer(data=request.data)
+        if serializer.is_valid():
+            return Response(serializer.validated_data, status=status.HTTP_200_OK)
+        
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+class VerifyTokenView(APIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        try:
+            user = request.user
+            
+            return Response({
+                'user': {
+                    'id': str(user.id),
+                    'name': user.get_full_name() or user.username,
+                    'email': user.email,
+                }
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            return Response({
+                'error': 'Token verification failed'
             }, status=status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file